@@ -1,6 +1,4 @@
-
 import sys
-import os
 from pathlib import Path
 
 # Add src to path so we can import the sales_agent package
@@ -8,11 +6,12 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 if __name__ == "__main__":
     try:
-        # Run the analysis agent module
-        import runpy
-        runpy.run_module("sales_agent.agents.analysis_agent", run_name="__main__", alter_sys=True)
+        from sales_agent.agents.analysis_agent import _cli_main
     except ImportError as e:
         print(f"[ImportError] starting agent: {e}")
         print("Please ensure you are in the project root directory and the environment is set up correctly.")
-    except Exception as e:
-        print(f"[Error]: {e}")
+    else:
+        try:
+            _cli_main()
+        except Exception as e:
+            print(f"[Error]: {e}")
@@ -24,6 +24,9 @@ from sales_agent.agents.orchestrator import OrchestratorAgent
 from sales_agent.utils.config import validate_config
 
 
+_EXIT_COMMANDS = frozenset(('exit', 'quit', 'q'))
+
+
 def print_welcome():
     """Print welcome message."""
     print("\n" + "="*70)
@@ -76,15 +79,16 @@ def main():
                 continue
             
             # Handle commands
-            if user_input.lower() in ['exit', 'quit', 'q']:
+            cmd = user_input.lower()
+            if cmd in _EXIT_COMMANDS:
                 print("\n👋 Goodbye! Thanks for using the Multi-Agent Sales Analysis System!\n")
                 break
             
-            elif user_input.lower() == 'help':
+            elif cmd == 'help':
                 print_help()
                 continue
             
-            elif user_input.lower() == 'new':
+            elif cmd == 'new':
                 orchestrator = None
                 print("\n✨ Starting new conversation...")
                 continue
@@ -7,13 +7,16 @@ A conversational AI system for intelligent sales data analysis.
 
 from setuptools import setup, find_packages
 
+with open("README.md", encoding="utf-8") as readme:
+    long_description = readme.read()
+
 setup(
     name="multi-agent-sales-analysis",
     version="1.0.0",
     author="Your Name",
     author_email="your.email@example.com",
     description="Multi-agent sales analysis system with LLM + function hybrid approach",
-    long_description=open("README.md").read(),
+    long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/multi-agent-sales-analysis",
     package_dir={"": "src"},
@@ -34,9 +37,11 @@ setup(
         "langchain-google-genai>=1.0.0",
         "langgraph>=0.0.20",
         "google-generativeai>=0.3.2",
-        "pandas>=2.1.4",
+        "pandas>=2.2.0",
         "numpy>=1.26.2",
         "openpyxl>=3.1.2",
+        "python-calamine>=0.1.7",
+        "xlsxwriter>=3.1.9",
         "xlrd>=2.0.1",
         "google-auth>=2.25.2",
         "google-auth-oauthlib>=1.2.0",
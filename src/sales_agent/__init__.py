@@ -27,12 +27,22 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from sales_agent.agents.orchestrator import OrchestratorAgent
-from sales_agent.agents.data_retrieval_agent import DataRetrievalAgent
-from sales_agent.agents.analysis_agent import AnalysisAgent
-
 __all__ = [
     "OrchestratorAgent",
     "DataRetrievalAgent",
     "AnalysisAgent",
 ]
+
+# Agents pull in pandas and LLM SDKs, so they are imported on first access
+_LAZY_IMPORTS = {
+    "OrchestratorAgent": "sales_agent.agents.orchestrator",
+    "DataRetrievalAgent": "sales_agent.agents.data_retrieval_agent",
+    "AnalysisAgent": "sales_agent.agents.analysis_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
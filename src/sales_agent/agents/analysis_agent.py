@@ -1,22 +1,20 @@
 """Analysis Agent - utilizing Dynamic Code Generation for 'Excel Expert' capabilities."""
 
-import pandas as pd
-import numpy as np
-import re
+import threading
+from collections import deque
 from typing import Dict, Any, List, Optional
-from pathlib import Path
-
-# Config and LLM
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from sales_agent.utils.config import (
-    GOOGLE_API_KEY, GROQ_API_KEY, 
-    LLM_MODEL, LLM_TEMPERATURE, LLM_PROVIDER
+
+# pandas, numpy, LangChain and the code executor are imported where used so
+# importing this module (and the package) stays fast.
+from sales_agent.utils.llm import get_llm, max_tokens_kwargs, supports_prefix_caching
+from sales_agent.utils.llm_cache import (
+    InMemoryCache, dataframe_fingerprint, make_cache_key
 )
 
-# Code Execution (Using local import path)
-from sales_agent.utils.code_executor import execute_pandas_code
-from sales_agent.functions.data_ops import read_sales_data, calculate_insights
+# Generated code shared across agent instances, keyed by (df fingerprint, query)
+_code_cache = InMemoryCache(maxsize=256)
+# Proactive insights keyed by df fingerprint, so reloading the same file is free
+_insights_cache = InMemoryCache(maxsize=16)
 
 class AnalysisAgent:
     """
@@ -25,37 +23,57 @@ class AnalysisAgent:
     Instead of hardcoded functions, this agent acts as an 'Excel Expert' 
     by generating and executing Pandas code to solve ANY user query.
     """
+
+    # Kept byte-identical across calls so providers can cache the prompt prefix.
+    _SYSTEM_PREFIX = """
+You are an expert Python Data Analyst. 
+You have a pandas DataFrame named 'df'.
+
+INSTRUCTIONS:
+1. Write Python code to answer the query using 'df'.
+2. Data is already cleaned: text columns are whitespace-stripped strings and
+   fully numeric columns are numeric. Do NOT re-convert or re-strip those.
+   - A column with a few non-numeric entries ('N/A', '-', '$1,200') keeps a
+     string/object dtype (see DATA SCHEMA). Before doing math on one, convert it:
+     `pd.to_numeric(df['col'].str.replace(r'[$,]', '', regex=True), errors='coerce')`
+3. PRE-PLOTTING CHECK:
+   - If grouping by a column, DROP rows where that column is missing or empty BEFORE plotting.
+   - Do NOT plot "Unknown" values unless explicitly asked.
+4. Save the final result to a variable named `result`.
+   - If the result is a number/text, `result = ...`
+   - If the result is a filtered dataframe, `result = filtered_df`
+   - If the user asks for a plot/chart:
+     - Use `matplotlib.pyplot` or `seaborn`.
+     - Save figure to 'temp_downloads/chart.png'.
+     - Set `result = "Chart saved to temp_downloads/chart.png"`.
+   - If the user asks to save/export data to Excel:
+     - Use `out_df.to_excel('temp_downloads/output.xlsx', index=False, engine='xlsxwriter')`.
+     - Set `result = "Data saved to temp_downloads/output.xlsx"`.
+5. Output ONLY the Python code. No markdown, no comments.
+"""
     
     def __init__(self):
         """Initialize the analysis agent with LLM."""
-        if LLM_PROVIDER == "groq":
-            if not GROQ_API_KEY:
-                raise ValueError("GROQ_API_KEY is not set.")
-            self.llm = ChatGroq(
-                model_name=LLM_MODEL,
-                groq_api_key=GROQ_API_KEY,
-                temperature=0  # Zero temperature for precise code generation
-            )
-            print(f"Initialized Groq LLM: {LLM_MODEL} (Code Gen Mode)")
-            
-        else:
-            if not GOOGLE_API_KEY:
-                raise ValueError("GOOGLE_API_KEY is not set.")
-            self.llm = ChatGoogleGenerativeAI(
-                model=LLM_MODEL,
-                google_api_key=GOOGLE_API_KEY,
-                temperature=0
-            )
-            print(f"Initialized Gemini LLM: {LLM_MODEL} (Code Gen Mode)")
+        self.llm = get_llm()
             
         self.df = None
         self.file_path = None
+        self._schema_info = ""
+        self._head_str = ""
+        self._schema_block = ""
+        self._df_fingerprint = None
+        # Recent (query, code) turns sent as context for follow-up queries
+        self._history = deque(maxlen=4)
     
     def load_data(self, file_path: str) -> bool:
         """Load data and perform initial auto-analysis."""
+        from sales_agent.functions.data_ops import read_sales_data, clean_sales_data
         try:
-            self.df = read_sales_data(file_path)
+            # Clean once here rather than in every generated snippet
+            self.df = clean_sales_data(read_sales_data(file_path))
             self.file_path = file_path
+            self._refresh_data_context()
+            self._history.clear()
             print(f"\n Data loaded: {len(self.df)} rows, {len(self.df.columns)} columns")
             
             # Initial proactive insights
@@ -66,10 +84,55 @@ class AnalysisAgent:
             print(f" Error loading data: {e}")
             return False
             
+    def start_warm_up(self):
+        """
+        Send the static prompt prefix in the background so the provider caches it.
+        
+        Returns immediately; nothing waits for the reply. Skipped for models
+        without prefix caching, where the request would only cost tokens.
+        """
+        if not supports_prefix_caching():
+            return
+        threading.Thread(target=self._warm_up, name="llm-warm-up", daemon=True).start()
+
+    def _warm_up(self):
+        """Request a one-token reply to the system prefix (runs on a background thread)."""
+        from langchain_core.messages import HumanMessage, SystemMessage
+        try:
+            # Providers reject a system-only request, so add a minimal user turn
+            self.llm.invoke(
+                [SystemMessage(content=self._SYSTEM_PREFIX), HumanMessage(content="OK")],
+                **max_tokens_kwargs(1)
+            )
+        except Exception as e:
+            print(f"LLM warm-up skipped: {e}")
+
+    def _refresh_data_context(self, fingerprint: Optional[str] = None):
+        """Rebuild the prompt schema and fingerprint for the current self.df."""
+        self._schema_block = self._build_schema_block()
+        self._df_fingerprint = fingerprint or dataframe_fingerprint(self.df)
+
+    def _build_schema_block(self) -> str:
+        """Build the schema/sample context once per data load."""
+        self._schema_info = "\n".join(f"{c}: {d}" for c, d in self.df.dtypes.items())
+        self._head_str = self.df.head(3).to_string()
+        
+        return f"""
+DATA SCHEMA ({len(self.df)} rows):
+{self._schema_info}
+
+SAMPLE DATA:
+{self._head_str}
+"""
+
     def _proactive_analysis(self):
         """Automatically detect key trends and stats on load."""
+        from sales_agent.functions.data_ops import calculate_insights
         try:
-            insights = calculate_insights(self.df)
+            insights = _insights_cache.get(self._df_fingerprint)
+            if insights is None:
+                insights = calculate_insights(self.df)
+                _insights_cache.set(self._df_fingerprint, insights)
             print("\n  **Auto-Discovery:**")
             print(f"   • Total Sales: {insights.get('total_sales', 'N/A'):,.2f}")
             print(f"   • Records: {insights.get('total_records', 0)}")
@@ -89,15 +152,66 @@ class AnalysisAgent:
 
         print(f"\n Thinking about: '{query}'...")
         
-        # 1. Generate Code
-        code = self._generate_code(query)
+        # 1. Generate Code (key taken before this turn joins the history)
+        cache_key = self._cache_key(query)
+        code = self._generate_code(query, cache_key)
+        
+        # 2-3. Execute and explain
+        outcome = self._run_code(query, code)
+        if outcome["success"]:
+            self._remember(query, code, cache_key)
+        return outcome
+
+    def execute_analysis_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Run several queries, issuing their code-generation LLM calls concurrently.
+        
+        Args:
+            queries: User queries against the loaded data
+            
+        Returns:
+            One result dictionary per query, in the same order
+        """
+        if self.df is None:
+            return [{"error": "No data loaded"} for _ in queries]
+
+        print(f"\n Thinking about {len(queries)} queries...")
+        
+        # Batch members share the pre-batch context, so take every key up front
+        keys = [self._cache_key(q) for q in queries]
+        codes = self._generate_codes(queries, keys)
+        
+        # Generated code may plot via pyplot's global state, so execute in order
+        outcomes = []
+        for query, code, cache_key in zip(queries, codes, keys):
+            outcome = self._run_code(query, code)
+            if outcome["success"]:
+                self._remember(query, code, cache_key)
+            outcomes.append(outcome)
+        return outcomes
+
+    def _run_code(self, query: str, code: Optional[str]) -> Dict[str, Any]:
+        """Execute generated code and format its result."""
         if not code:
             return {"success": False, "message": "Failed to generate analysis code."}
             
         # print(f" Generated Code:\n{'-'*20}\n{code}\n{'-'*20}")
         
-        # 2. Execute Code
-        exec_result = execute_pandas_code(self.df, code)
+        import pandas as pd
+        from sales_agent.utils.code_executor import execute_pandas_code
+        exec_result = execute_pandas_code(self.df, code, df_id=self._df_fingerprint)
+        
+        # Edits to df persist across queries (later code in the history relies
+        # on them). A rebound df (df = df[...]) comes back as modified_df and a
+        # worker's in-place edits as edited_df; an in-process run (the pool
+        # fallback) edits self.df directly, so always re-check the fingerprint
+        if isinstance(exec_result.get("modified_df"), pd.DataFrame):
+            self.df = exec_result["modified_df"]
+        elif exec_result.get("edited_df") is not None:
+            self.df = exec_result["edited_df"]
+        fingerprint = dataframe_fingerprint(self.df)
+        if fingerprint != self._df_fingerprint:
+            self._refresh_data_context(fingerprint)
         
         if not exec_result["success"]:
             return {
@@ -107,7 +221,6 @@ class AnalysisAgent:
             
         result_data = exec_result["result"]
         
-        # 3. Format/Explain Output
         final_response = self._format_result(query, result_data)
         
         return {
@@ -116,63 +229,95 @@ class AnalysisAgent:
             "data": result_data
         }
 
-    def _generate_code(self, query: str) -> str:
-        """Use LLM to interpret query and write Pandas code."""
-        
-        # Prepare context (schema info)
-        import io
-        buffer = io.StringIO()
-        self.df.info(buf=buffer)
-        schema_info = buffer.getvalue()
-        # Handle cases where .info() prints to stdout instead of buffer in older pandas
-        if not schema_info: 
-             schema_info = str(self.df.dtypes)
-             
-        head_info = self.df.head(3).to_string()
+    def _build_messages(self, query: str) -> list:
+        """Build the chat messages for a code-generation request."""
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+        # Static instructions + schema first, volatile turns last, so the
+        # provider sees a byte-identical prefix across queries on this df.
+        messages = [SystemMessage(content=f"{self._SYSTEM_PREFIX}\n{self._schema_block}")]
+        for past_query, past_code in self._history:
+            messages.append(HumanMessage(content=f'USER QUERY: "{past_query}"'))
+            messages.append(AIMessage(content=past_code))
+        messages.append(HumanMessage(content=f'USER QUERY: "{query}"'))
+        return messages
+
+    def _cache_key(self, query: str) -> str:
+        """Cache key for a query given the current conversation context."""
+        return make_cache_key(
+            self._df_fingerprint, query, [past_query for past_query, _ in self._history]
+        )
+
+    def _remember(self, query: str, code: str, cache_key: str):
+        """
+        Cache code that ran successfully and add it to the follow-up history.
         
-        prompt = f"""
-You are an expert Python Data Analyst. 
-You have a pandas DataFrame named 'df'.
+        Failed code is neither cached nor sent as context, so retrying the
+        query asks the LLM again.
+        """
+        _code_cache.set(cache_key, code)
+        self._history.append((query, code))
 
-USER QUERY: "{query}"
+    @staticmethod
+    def _clean_code(content: str) -> str:
+        """Strip markdown code fences from an LLM response."""
+        code = content.strip()
+        if code.startswith("```"):
+            code = code[3:]
+            if code.startswith("python"):
+                code = code[len("python"):]
+        fence = code.find("```")
+        if fence != -1:
+            code = code[:fence]
+        return code.strip()
 
-DATA SCHEMA:
-{schema_info}
+    @staticmethod
+    def _fence_closed(buffer: str) -> bool:
+        """Check whether a streamed response has finished its fenced code block."""
+        text = buffer.lstrip()
+        return text.startswith("```") and text.find("```", 3) != -1
 
-SAMPLE DATA:
-{head_info}
+    def _generate_code(self, query: str, cache_key: Optional[str] = None) -> str:
+        """Use LLM to interpret query and write Pandas code."""
+        # The key covers the earlier queries, so code is only reused in the same context
+        cached = _code_cache.get(cache_key or self._cache_key(query))
+        if cached is not None:
+            return cached
 
-INSTRUCTIONS:
-1. Write Python code to answer the query using 'df'.
-2. IMPORTANT: Handle data types! 
-   - Convert numeric columns: `pd.to_numeric(df['col'], errors='coerce')`
-   - Clean categorical columns: `df['col'] = df['col'].astype(str).str.strip()` to remove whitespace.
-3. PRE-PLOTTING CHECK:
-   - If grouping by a column, DROP rows where that column is 'nan', 'None', or empty BEFORE plotting.
-   - Do NOT plot "Unknown" values unless explicitly asked.
-4. Save the final result to a variable named `result`.
-   - If the result is a number/text, `result = ...`
-   - If the result is a filtered dataframe, `result = filtered_df`
-   - If the user asks for a plot/chart:
-     - Use `matplotlib.pyplot` or `seaborn`.
-     - Save figure to 'temp_downloads/chart.png'.
-     - Set `result = "Chart saved to temp_downloads/chart.png"`.
-5. Output ONLY the Python code. No markdown, no comments.
-"""
         try:
-            response = self.llm.invoke(prompt)
-            code = response.content.strip()
-            # Clean markdown code blocks
-            code = re.sub(r'```python', '', code)
-            code = re.sub(r'```', '', code)
-            return code.strip()
+            # Stream so we can stop as soon as the code block closes
+            buffer = ""
+            for chunk in self.llm.stream(self._build_messages(query)):
+                buffer += chunk.content
+                if self._fence_closed(buffer):
+                    break
+            return self._clean_code(buffer)
             
         except Exception as e:
             print(f"Error generating code: {e}")
             return None
 
+    def _generate_codes(self, queries: List[str], keys: List[str]) -> List[Optional[str]]:
+        """Generate code for several queries with a single concurrent LLM batch."""
+        codes = [_code_cache.get(k) for k in keys]
+        pending = [i for i, code in enumerate(codes) if code is None]
+
+        # Sync batch fans out on a thread pool; the shared client's async side
+        # is bound to whichever event loop first used it, so abatch can't be used
+        responses = self.llm.batch(
+            [self._build_messages(queries[i]) for i in pending],
+            return_exceptions=True
+        ) if pending else []
+        for i, response in zip(pending, responses):
+            if isinstance(response, Exception):
+                print(f"Error generating code: {response}")
+                continue
+            codes[i] = self._clean_code(response.content) or None
+        return codes
+
     def _format_result(self, query: str, result: Any) -> str:
         """Format the raw result into a nice natural language response."""
+        import numpy as np
+        import pandas as pd
         
         if isinstance(result, (int, float, np.number)):
              return f"**Result:** {result:,.2f}"
@@ -192,7 +337,8 @@ INSTRUCTIONS:
         else:
             return str(result)
 
-if __name__ == "__main__":
+def _cli_main():
+    """Interactive standalone mode: load a file and answer queries."""
     import sys
     import os
     
@@ -225,3 +371,7 @@ if __name__ == "__main__":
                 break
         else:
             print(f" [Error] File not found: {file_path_input}")
+
+
+if __name__ == "__main__":
+    _cli_main()
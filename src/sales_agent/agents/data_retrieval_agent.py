@@ -1,12 +1,19 @@
 """Data Retrieval Agent - Handles conversational data source detection and file retrieval."""
 
+import re
 from typing import Optional, Tuple
 from sales_agent.utils.conversation_state import ConversationState
-from sales_agent.data_sources.google_drive import GoogleDriveClient
 from sales_agent.data_sources.local_storage import get_local_file
 from pathlib import Path
 
 
+# Data source keywords (matched at word starts against lowercased input).
+# These also cover drive.google.com / docs.google.com URLs and s3:// paths.
+_GDRIVE_RE = re.compile(r"\b(?:drive|google|gdrive)")
+_S3_RE = re.compile(r"\b(?:s3|aws|bucket)")
+_LOCAL_RE = re.compile(r"\b(?:local|file|computer|disk)")
+
+
 class DataRetrievalAgent:
     """Agent responsible for retrieving data from various sources."""
     
@@ -26,19 +33,15 @@ class DataRetrievalAgent:
         """
         user_input_lower = user_input.lower()
         
-        if any(keyword in user_input_lower for keyword in ['drive', 'google', 'gdrive']):
+        if _GDRIVE_RE.search(user_input_lower):
             return 'google_drive'
-        elif any(keyword in user_input_lower for keyword in ['s3', 'aws', 'bucket']):
+        elif _S3_RE.search(user_input_lower):
             return 's3'
-        elif any(keyword in user_input_lower for keyword in ['local', 'file', 'computer', 'disk']):
+        elif _LOCAL_RE.search(user_input_lower):
             return 'local'
         
-        # Check if it's a URL
-        if 'drive.google.com' in user_input_lower or 'docs.google.com' in user_input_lower:
-            return 'google_drive'
-        elif user_input_lower.startswith('s3://'):
-            return 's3'
-        elif Path(user_input).exists():
+        # Only touch the filesystem when no keyword matched
+        if Path(user_input).exists():
             return 'local'
         
         return None
@@ -114,7 +117,9 @@ class DataRetrievalAgent:
             print("\n[Auth] Initializing Google Drive client...")
             
             if self.google_drive_client is None:
-                self.google_drive_client = GoogleDriveClient()
+                # Google API client libraries are heavy; load them on first use
+                from sales_agent.data_sources.google_drive import get_drive_client
+                self.google_drive_client = get_drive_client()
             
             print("[Download] Downloading file from Google Drive...")
             file_path = self.google_drive_client.download_file(url_or_id)
@@ -1,11 +1,15 @@
 """Orchestrator Agent - Main coordinator for multi-agent system."""
 
-from typing import Optional
+import re
 from sales_agent.utils.conversation_state import ConversationState
 from sales_agent.agents.data_retrieval_agent import DataRetrievalAgent
 from sales_agent.agents.analysis_agent import AnalysisAgent
 
 
+# Keywords that indicate a query needs sales data (matched at word starts)
+_NEEDS_DATA_RE = re.compile(r"\b(?:sales|revenue|data|quarter|month|analyze|show|calculate)")
+
+
 class OrchestratorAgent:
     """Main orchestrator that coordinates between agents."""
     
@@ -73,10 +77,7 @@ class OrchestratorAgent:
     def _query_needs_data(self, query: str) -> bool:
         """Determine if query needs data."""
         # Most sales analysis queries need data
-        query_lower = query.lower()
-        return any(keyword in query_lower for keyword in [
-            'sales', 'revenue', 'data', 'quarter', 'month', 'analyze', 'show', 'calculate'
-        ])
+        return _NEEDS_DATA_RE.search(query.lower()) is not None
     
     def _handle_data_source_response(self, user_input: str) -> str:
         """Handle user's response about data source."""
@@ -115,11 +116,12 @@ class OrchestratorAgent:
             else:
                 return "[Error] Could not detect data source. Please start over."
         
+        # Warm the LLM prompt prefix in the background while the data is fetched
+        self.analysis_agent.start_warm_up()
+        
         # Retrieve the data
         success, message, file_path = self.data_agent.retrieve_data(
-            data_source,
-            user_input,
-            self.state
+            data_source, user_input, self.state
         )
         
         if success:
@@ -128,6 +130,7 @@ class OrchestratorAgent:
                 self.current_step = "ready_for_analysis"
                 
                 # Automatically analyze based on original query
+                analysis_response = self._handle_analysis_query(self.state.original_query)
                 response = f"{message}\n\n{analysis_response}"
             else:
                 response = f"{message}\n\n[Error] Failed to load data for analysis."
@@ -141,16 +144,23 @@ class OrchestratorAgent:
         """Handle analysis query."""
         print(f"\n[Analysis] Analyzing: {query}")
         
-        results = self.analysis_agent.execute_analysis(query)
-        
-        response = results.get("message", "Analysis complete!")
+        # Several queries separated by ';' share one concurrent LLM batch
+        queries = [q.strip() for q in query.split(';') if q.strip()]
+        if len(queries) > 1:
+            batch = self.analysis_agent.execute_analysis_batch(queries)
+        else:
+            batch = [self.analysis_agent.execute_analysis(query)]
         
-        if results.get("success"):
-            self.state.set_results(results.get("data", {}))
-            if results.get("data", {}).get("output_file"):
-                self.state.set_output_file(results["data"]["output_file"])
+        responses = []
+        for results in batch:
+            responses.append(results.get("message", "Analysis complete!"))
+            
+            if results.get("success"):
+                self.state.set_results(results.get("data", {}))
+                if results.get("data", {}).get("output_file"):
+                    self.state.set_output_file(results["data"]["output_file"])
         
-        return response
+        return "\n\n".join(responses)
     
     def get_conversation_summary(self) -> dict:
         """Get summary of the conversation."""
@@ -1,21 +1,47 @@
 """Google Drive integration for downloading sales data files."""
 
-import io
+import hashlib
+import json
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from google.oauth2.credentials import Credentials
+from typing import List, Optional
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import MediaIoBaseDownload, DEFAULT_CHUNK_SIZE
 import pickle
 
 
 # If modifying these scopes, delete the file token.pickle
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
+# File ID in Drive URLs: /d/FILE_ID or id=FILE_ID
+_FILE_ID_RE = re.compile(r'(?:/d/|id=)([a-zA-Z0-9-_]+)')
+
+# Smallest chunk_size accepted by download_file (one request per chunk)
+MIN_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Files at least this large are fetched as parallel byte ranges
+RANGED_DOWNLOAD_THRESHOLD = 256 * 1024 * 1024
+RANGED_DOWNLOAD_PARTS = 8
+RANGE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Block size for hashing cached downloads
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _file_md5(path: Path) -> str:
+    """MD5 hex digest of a local file, read in blocks."""
+    digest = hashlib.md5()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
 
 class GoogleDriveClient:
     """Client for interacting with Google Drive API."""
@@ -29,6 +55,9 @@ class GoogleDriveClient:
         """
         self.credentials_path = credentials_path or 'credentials/credentials.json'
         self.service = None
+        self._creds = None
+        # httplib2 connections are not thread-safe: one service per thread
+        self._local = threading.local()
         self._authenticate()
     
     def _authenticate(self):
@@ -62,9 +91,23 @@ class GoogleDriveClient:
             with open(token_path, 'wb') as token:
                 pickle.dump(creds, token)
         
-        self.service = build('drive', 'v3', credentials=creds)
+        self._creds = creds
+        self.service = self._build_service()
+        self._local.service = self.service
         print("✅ Authenticated with Google Drive")
     
+    def _build_service(self):
+        """Build a Drive API service from the stored credentials."""
+        # Use the discovery document bundled with googleapiclient (no fetch)
+        return build('drive', 'v3', credentials=self._creds, static_discovery=True)
+    
+    def _thread_service(self):
+        """Get the Drive service owned by the calling thread."""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self._local.service = self._build_service()
+        return service
+    
     def extract_file_id(self, url_or_id: str) -> str:
         """
         Extract file ID from Google Drive URL or return ID if already provided.
@@ -84,15 +127,9 @@ class GoogleDriveClient:
             return url_or_id
         
         # Extract ID from URL
-        patterns = [
-            r'/d/([a-zA-Z0-9-_]+)',  # /d/FILE_ID
-            r'id=([a-zA-Z0-9-_]+)',  # id=FILE_ID
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url_or_id)
-            if match:
-                return match.group(1)
+        match = _FILE_ID_RE.search(url_or_id)
+        if match:
+            return match.group(1)
         
         raise ValueError(f"Could not extract file ID from: {url_or_id}")
     
@@ -100,7 +137,9 @@ class GoogleDriveClient:
         self,
         file_id_or_url: str,
         output_dir: str = 'temp_downloads',
-        filename: Optional[str] = None
+        filename: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        use_cache: bool = True
     ) -> str:
         """
         Download file from Google Drive.
@@ -109,16 +148,22 @@ class GoogleDriveClient:
             file_id_or_url: Google Drive file ID or URL
             output_dir: Directory to save the file
             filename: Optional custom filename (otherwise uses Drive filename)
+            chunk_size: Bytes fetched per request (default: googleapiclient's
+                100 MiB). Larger chunks mean fewer round trips; up to this
+                many bytes are held in memory at a time.
+            use_cache: Reuse a previous download in output_dir if the Drive
+                file hasn't been modified since
             
         Returns:
             Path to downloaded file
         """
         file_id = self.extract_file_id(file_id_or_url)
+        service = self._thread_service()
         
         # Get file metadata
-        file_metadata = self.service.files().get(
+        file_metadata = service.files().get(
             fileId=file_id,
-            fields='name, mimeType'
+            fields='name, mimeType, size, modifiedTime, md5Checksum'
         ).execute()
         
         file_name = filename or file_metadata['name']
@@ -128,35 +173,161 @@ class GoogleDriveClient:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Handle Google Sheets (export as Excel)
         if 'spreadsheet' in mime_type:
             file_name = file_name if file_name.endswith('.xlsx') else f"{file_name}.xlsx"
-            request = self.service.files().export_media(
+        output_file = output_path / file_name
+        meta_file = output_path / f"{file_id}.meta.json"
+        
+        if use_cache and self._is_cached(output_file, meta_file, file_metadata):
+            print(f"✅ Using cached download: {file_name} (unchanged on Drive)")
+            return str(output_file)
+        
+        # Download beside the target and move it into place when complete, so an
+        # interrupted download never leaves a truncated file the cache accepts
+        if meta_file.exists():
+            meta_file.unlink()
+        partial_file = output_path / f"{file_name}.part"
+        
+        # Handle Google Sheets (export as Excel)
+        if 'spreadsheet' in mime_type:
+            request = service.files().export_media(
                 fileId=file_id,
                 mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             )
         else:
+            size = int(file_metadata.get('size', 0))
+            if size >= RANGED_DOWNLOAD_THRESHOLD:
+                self._download_ranged(file_id, size, partial_file)
+                os.replace(partial_file, output_file)
+                self._write_cache_meta(meta_file, output_file, file_metadata)
+                print(f"✅ Downloaded: {file_name} ({size / 1024:.1f} KB)")
+                return str(output_file)
+            
             # Regular file download
-            request = self.service.files().get_media(fileId=file_id)
+            request = service.files().get_media(fileId=file_id)
         
-        # Download file
-        output_file = output_path / file_name
-        fh = io.BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
+        # Download file, streaming chunks straight to disk
+        downloaded = 0
+        with open(partial_file, 'wb') as fh:
+            downloader = MediaIoBaseDownload(
+                fh, request, chunksize=max(chunk_size, MIN_DOWNLOAD_CHUNK_SIZE)
+            )
+            
+            done = False
+            while not done:
+                status, done = downloader.next_chunk()
+                if status:
+                    downloaded = status.resumable_progress
+                    print(f"⬇️  Download {int(status.progress() * 100)}%")
         
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-            if status:
-                print(f"⬇️  Download {int(status.progress() * 100)}%")
+        os.replace(partial_file, output_file)
+        self._write_cache_meta(meta_file, output_file, file_metadata)
+        print(f"✅ Downloaded: {file_name} ({downloaded / 1024:.1f} KB)")
         
-        # Write to file
-        with open(output_file, 'wb') as f:
-            f.write(fh.getvalue())
+        return str(output_file)
+    
+    @staticmethod
+    def _is_cached(output_file: Path, meta_file: Path, file_metadata: dict) -> bool:
+        """
+        Check whether output_file is an up-to-date copy of the Drive file.
         
-        print(f"✅ Downloaded: {file_name} ({len(fh.getvalue()) / 1024:.1f} KB)")
+        Args:
+            output_file: Local path the file would be downloaded to
+            meta_file: Metadata recorded by the previous download
+            file_metadata: Current Drive metadata for the file
+            
+        Returns:
+            True if the previous download can be reused
+        """
+        if not output_file.exists() or not meta_file.exists():
+            return False
         
-        return str(output_file)
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as fh:
+                cached = json.load(fh)
+        except (OSError, ValueError):
+            return False
+        
+        if cached.get('name') != output_file.name:
+            return False
+        if cached.get('modifiedTime') != file_metadata.get('modifiedTime'):
+            return False
+        
+        # Binary files carry a checksum; Google Sheets exports don't
+        md5 = file_metadata.get('md5Checksum')
+        return md5 is None or _file_md5(output_file) == md5
+    
+    @staticmethod
+    def _write_cache_meta(meta_file: Path, output_file: Path, file_metadata: dict):
+        """Record what was downloaded so later calls can skip unchanged files."""
+        with open(meta_file, 'w', encoding='utf-8') as fh:
+            json.dump({
+                'name': output_file.name,
+                'modifiedTime': file_metadata.get('modifiedTime'),
+                'md5Checksum': file_metadata.get('md5Checksum'),
+            }, fh)
+    
+    def _download_ranged(
+        self,
+        file_id: str,
+        size: int,
+        output_file: Path,
+        num_parts: int = RANGED_DOWNLOAD_PARTS
+    ):
+        """
+        Download a large binary file as parallel byte ranges.
+        
+        Args:
+            file_id: Google Drive file ID
+            size: File size in bytes
+            output_file: Destination path
+            num_parts: Number of ranges fetched concurrently
+        """
+        # Pre-size the file so each part can write at its own offset
+        with open(output_file, 'wb') as fh:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fh.fileno(), 0, size)
+            else:
+                fh.truncate(size)
+        
+        part_size = -(-size // num_parts)
+        
+        def fetch(start: int):
+            end = min(start + part_size, size)
+            service = self._thread_service()
+            with open(output_file, 'r+b') as fh:
+                for offset in range(start, end, RANGE_CHUNK_SIZE):
+                    last = min(offset + RANGE_CHUNK_SIZE, end) - 1
+                    request = service.files().get_media(fileId=file_id)
+                    request.headers['Range'] = f'bytes={offset}-{last}'
+                    fh.seek(offset)
+                    fh.write(request.execute())
+        
+        with ThreadPoolExecutor(max_workers=num_parts) as executor:
+            list(executor.map(fetch, range(0, size, part_size)))
+    
+    def download_files(
+        self,
+        ids_or_urls: List[str],
+        output_dir: str = 'temp_downloads',
+        max_workers: int = 8
+    ) -> List[str]:
+        """
+        Download several files from Google Drive concurrently.
+        
+        Args:
+            ids_or_urls: Google Drive file IDs or URLs
+            output_dir: Directory to save the files
+            max_workers: Maximum number of simultaneous downloads
+            
+        Returns:
+            Paths to downloaded files, in the same order as ids_or_urls
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda url_or_id: self.download_file(url_or_id, output_dir),
+                ids_or_urls
+            ))
     
     def list_files(self, query: Optional[str] = None, max_results: int = 10) -> list:
         """
@@ -187,6 +358,20 @@ class GoogleDriveClient:
         return files
 
 
+@lru_cache(maxsize=4)
+def get_drive_client(credentials_path: Optional[str] = None) -> GoogleDriveClient:
+    """
+    Get an authenticated Google Drive client, reused across calls.
+    
+    Args:
+        credentials_path: Path to credentials.json
+        
+    Returns:
+        Shared GoogleDriveClient for these credentials
+    """
+    return GoogleDriveClient(credentials_path)
+
+
 def download_from_drive(
     url_or_id: str,
     credentials_path: Optional[str] = None,
@@ -203,7 +388,7 @@ def download_from_drive(
     Returns:
         Path to downloaded file
     """
-    client = GoogleDriveClient(credentials_path)
+    client = get_drive_client(credentials_path)
     return client.download_file(url_or_id, output_dir)
 
 
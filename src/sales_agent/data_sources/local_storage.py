@@ -51,7 +51,8 @@ def copy_to_working_dir(
     dest_dir.mkdir(parents=True, exist_ok=True)
     
     dest_file = dest_dir / file_path.name
-    shutil.copy2(file_path, dest_file)
+    # Contents only: copyfile uses the kernel fast path (sendfile) on Linux
+    shutil.copyfile(file_path, dest_file)
     
     print(f"✅ Copied to working directory: {dest_file.name}")
     
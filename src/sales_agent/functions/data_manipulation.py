@@ -1,16 +1,66 @@
 """Data manipulation module for adding columns and writing back to Excel."""
 
 import pandas as pd
+import numpy as np
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Union, Callable, Any, Optional
-import openpyxl
+from typing import Union, Callable, Any, Optional, List
+
+from sales_agent.utils.fast_excel import save_df
+
+try:
+    import numba
+except ImportError:  # Optional: scalar formulas fall back to DataFrame.apply
+    numba = None
+
+
+def vectorized(formula: Callable) -> Callable:
+    """
+    Mark a formula as vectorized for `add_column`.
+    
+    A vectorized formula receives the whole DataFrame and returns the new
+    column in one call, instead of being applied row by row. Pass the
+    returned wrapper to `add_column`; formula itself is left unchanged.
+    
+    Example:
+        profit = vectorized(lambda d: d['Revenue'] - d['Cost'])
+        add_column(df, 'Profit', formula=profit)
+    """
+    # Mark a wrapper, not formula itself: ufuncs and builtins (np.log, abs)
+    # don't accept new attributes
+    @wraps(formula)
+    def wrapper(df: pd.DataFrame):
+        return formula(df)
+    
+    wrapper._vectorized = True
+    return wrapper
+
+
+@lru_cache(maxsize=32)
+def _jit_vectorize(formula: Callable) -> Callable:
+    """Compile a scalar formula into a NumPy ufunc with numba (once per formula)."""
+    return numba.vectorize(nopython=True)(formula)
+
+
+def _apply_scalar_formula(df: pd.DataFrame, formula: Callable, inputs: List[str]):
+    """Evaluate formula(*row values of inputs) for every row."""
+    if numba is not None:
+        try:
+            return _jit_vectorize(formula)(*(df[col].to_numpy() for col in inputs))
+        except Exception:
+            # Formula not supported by numba (strings, objects, ...); use pandas
+            pass
+    
+    return df[inputs].apply(lambda row: formula(*row), axis=1)
 
 
 def add_column(
     df: pd.DataFrame,
     column_name: str,
     value: Any = None,
-    formula: Optional[Callable] = None
+    formula: Optional[Callable] = None,
+    inplace: bool = False,
+    inputs: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """
     Add a new column to the DataFrame.
@@ -19,18 +69,30 @@ def add_column(
         df: Input DataFrame
         column_name: Name of the new column
         value: Static value for all rows (if no formula provided)
-        formula: Function to calculate values (receives row as input)
+        formula: Function to calculate values (receives row as input, or the
+            whole DataFrame if wrapped with `vectorized`)
+        inplace: If True, modify df directly instead of a copy
+        inputs: Columns passed positionally to a scalar formula. The formula
+            is JIT-compiled with numba when installed and supported
         
     Returns:
         DataFrame with new column
         
     Example:
         add_column(df, 'Profit', formula=lambda row: row['Revenue'] - row['Cost'])
+        add_column(df, 'Profit', formula=vectorized(lambda d: d['Revenue'] - d['Cost']))
+        add_column(df, 'Profit', formula=lambda rev, cost: rev - cost, inputs=['Revenue', 'Cost'])
     """
-    df_copy = df.copy()
+    # Assigning columns never writes into shared blocks, so a shallow copy suffices
+    df_copy = df if inplace else df.copy(deep=False)
     
     if formula:
-        df_copy[column_name] = df_copy.apply(formula, axis=1)
+        if inputs:
+            df_copy[column_name] = _apply_scalar_formula(df_copy, formula, inputs)
+        elif getattr(formula, '_vectorized', False):
+            df_copy[column_name] = formula(df_copy)
+        else:
+            df_copy[column_name] = df_copy.apply(formula, axis=1)
     else:
         df_copy[column_name] = value
     
@@ -42,7 +104,8 @@ def add_column(
 def populate_column(
     df: pd.DataFrame,
     column_name: str,
-    values: Union[list, pd.Series, Any]
+    values: Union[list, pd.Series, Any],
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Populate an existing or new column with values.
@@ -51,11 +114,12 @@ def populate_column(
         df: Input DataFrame
         column_name: Name of the column
         values: Values to populate (list, Series, or single value)
+        inplace: If True, modify df directly instead of a copy
         
     Returns:
         DataFrame with populated column
     """
-    df_copy = df.copy()
+    df_copy = df if inplace else df.copy(deep=False)
     df_copy[column_name] = values
     
     print(f"✅ Populated column '{column_name}'")
@@ -94,23 +158,60 @@ def write_to_excel(
             ) as writer:
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
         else:
-            # Create new file
-            df.to_excel(file_path, sheet_name=sheet_name, index=False)
+            # Create new file without openpyxl (pyexcelerate or xlsxwriter)
+            return save_df(df, file_path, sheet_name)
         
         print(f"✅ Written {len(df)} rows to '{file_path.name}'")
         return str(file_path)
         
     except Exception as e:
         # Fallback: create new file
-        df.to_excel(file_path, sheet_name=sheet_name, index=False)
+        df.to_excel(file_path, sheet_name=sheet_name, index=False, engine='xlsxwriter')
         print(f"✅ Created new file '{file_path.name}' with {len(df)} rows")
         return str(file_path)
 
 
+def write_data(
+    df: pd.DataFrame,
+    file_path: Union[str, Path],
+    sheet_name: str = 'Sheet1',
+    preserve_formatting: bool = True
+) -> str:
+    """
+    Write DataFrame to a file, choosing the format from its extension.
+    
+    Parquet and CSV are far faster to write than Excel, so prefer them
+    unless the output has to be opened as a spreadsheet.
+    
+    Args:
+        df: DataFrame to write
+        file_path: Output path (.parquet, .csv, or an Excel file)
+        sheet_name: Name of the sheet (Excel only)
+        preserve_formatting: If True and file exists, preserve formatting (Excel only)
+        
+    Returns:
+        Path to written file
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    
+    if suffix == '.parquet':
+        df.to_parquet(file_path, index=False, compression='zstd')
+    elif suffix == '.csv':
+        df.to_csv(file_path, index=False)
+    else:
+        return write_to_excel(df, file_path, sheet_name, preserve_formatting)
+    
+    print(f"✅ Written {len(df)} rows to '{file_path.name}'")
+    return str(file_path)
+
+
 def transform_column(
     df: pd.DataFrame,
     column_name: str,
-    transformation: Callable
+    transformation: Callable,
+    inplace: bool = False,
+    vectorize: bool = False
 ) -> pd.DataFrame:
     """
     Apply transformation to a column.
@@ -119,26 +220,43 @@ def transform_column(
         df: Input DataFrame
         column_name: Column to transform
         transformation: Function to apply
+        inplace: If True, modify df directly instead of a copy
+        vectorize: If True, call transformation once on the column's array
+            instead of once per element (NumPy ufuncs always are)
         
     Returns:
         DataFrame with transformed column
         
     Example:
         transform_column(df, 'Price', lambda x: x * 1.1)  # 10% increase
+        transform_column(df, 'Price', lambda x: x * 1.1, vectorize=True)  # same, faster
+        transform_column(df, 'Price', np.log)
     """
-    df_copy = df.copy()
-    df_copy[column_name] = df_copy[column_name].apply(transformation)
+    df_copy = df if inplace else df.copy(deep=False)
+    
+    if vectorize or isinstance(transformation, np.ufunc):
+        df_copy[column_name] = transformation(df_copy[column_name].to_numpy())
+    else:
+        df_copy[column_name] = df_copy[column_name].map(transformation)
     
     print(f"✅ Transformed column '{column_name}'")
     
     return df_copy
 
 
+def _float_values(df: pd.DataFrame, column: str) -> Optional[np.ndarray]:
+    """Column as a float64 array with missing values as NaN, or None if absent."""
+    if column not in df.columns:
+        return None
+    return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
 def create_derived_metrics(
     df: pd.DataFrame,
     revenue_col: str = 'Revenue',
     cost_col: str = 'Cost',
-    quantity_col: Optional[str] = None
+    quantity_col: Optional[str] = None,
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Create common derived metrics (profit margin, unit price, etc.).
@@ -148,34 +266,46 @@ def create_derived_metrics(
         revenue_col: Name of revenue column
         cost_col: Name of cost column
         quantity_col: Name of quantity column (optional)
+        inplace: If True, modify df directly instead of a copy
         
     Returns:
         DataFrame with derived metrics
     """
-    df_copy = df.copy()
+    df_copy = df if inplace else df.copy(deep=False)
     
-    # Profit
-    if revenue_col in df.columns and cost_col in df.columns:
-        df_copy['Profit'] = df_copy[revenue_col] - df_copy[cost_col]
-        df_copy['Profit_Margin_%'] = (df_copy['Profit'] / df_copy[revenue_col]) * 100
-        print("✅ Added 'Profit' and 'Profit_Margin_%'")
+    # Work on raw float arrays: rows are already aligned, so skip index alignment.
+    # float64 (NA as NaN) keeps nullable columns off object arrays, where a
+    # zero quantity would raise ZeroDivisionError instead of giving inf/NaN
+    revenue = _float_values(df_copy, revenue_col)
+    cost = _float_values(df_copy, cost_col)
     
-    # Unit metrics
-    if quantity_col and quantity_col in df.columns:
-        if revenue_col in df.columns:
-            df_copy['Unit_Price'] = df_copy[revenue_col] / df_copy[quantity_col]
-            print("✅ Added 'Unit_Price'")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Profit
+        if revenue is not None and cost is not None:
+            profit = revenue - cost
+            df_copy['Profit'] = profit
+            df_copy['Profit_Margin_%'] = (profit / revenue) * 100
+            print("✅ Added 'Profit' and 'Profit_Margin_%'")
         
-        if cost_col in df.columns:
-            df_copy['Unit_Cost'] = df_copy[cost_col] / df_copy[quantity_col]
-            print("✅ Added 'Unit_Cost'")
+        # Unit metrics
+        if quantity_col and quantity_col in df.columns:
+            quantity = _float_values(df_copy, quantity_col)
+            
+            if revenue is not None:
+                df_copy['Unit_Price'] = revenue / quantity
+                print("✅ Added 'Unit_Price'")
+            
+            if cost is not None:
+                df_copy['Unit_Cost'] = cost / quantity
+                print("✅ Added 'Unit_Cost'")
     
     return df_copy
 
 
 def rename_columns(
     df: pd.DataFrame,
-    rename_dict: dict
+    rename_dict: dict,
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Rename columns in DataFrame.
@@ -183,12 +313,16 @@ def rename_columns(
     Args:
         df: Input DataFrame
         rename_dict: Dictionary of old_name: new_name
+        inplace: If True, modify df directly instead of a copy
         
     Returns:
         DataFrame with renamed columns
     """
-    df_copy = df.copy()
-    df_copy = df_copy.rename(columns=rename_dict)
+    if inplace:
+        df.rename(columns=rename_dict, inplace=True)
+        df_copy = df
+    else:
+        df_copy = df.rename(columns=rename_dict)
     
     print(f"✅ Renamed {len(rename_dict)} columns")
     
@@ -197,7 +331,8 @@ def rename_columns(
 
 def drop_columns(
     df: pd.DataFrame,
-    columns: Union[str, list]
+    columns: Union[str, list],
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Drop columns from DataFrame.
@@ -205,16 +340,19 @@ def drop_columns(
     Args:
         df: Input DataFrame
         columns: Column name or list of column names to drop
+        inplace: If True, modify df directly instead of a copy
         
     Returns:
         DataFrame with columns removed
     """
-    df_copy = df.copy()
-    
     if isinstance(columns, str):
         columns = [columns]
     
-    df_copy = df_copy.drop(columns=columns, errors='ignore')
+    if inplace:
+        df.drop(columns=columns, errors='ignore', inplace=True)
+        df_copy = df
+    else:
+        df_copy = df.drop(columns=columns, errors='ignore')
     
     print(f"✅ Dropped {len(columns)} columns")
     
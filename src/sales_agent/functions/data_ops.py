@@ -5,13 +5,102 @@ import numpy as np
 from pathlib import Path
 from typing import Union, List, Dict, Any, Optional
 
+try:
+    from numba import njit
+except ImportError:  # Optional: grouping falls back to pandas groupby
+    njit = None
 
-def read_sales_data(file_path: Union[str, Path]) -> pd.DataFrame:
+# Aggregations the fused numba kernel can produce
+_FUSED_AGGS = frozenset({'sum', 'mean', 'count'})
+
+# Zero-padded codes (zip codes, IDs) must stay text: '02134', '-007'
+_ZERO_PADDED_RE = r'^[+-]?0\d'
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _group_sums(codes, values, n_groups):
+        """Per-group sums and non-NaN counts of every column, in one pass."""
+        sums = np.zeros((n_groups, values.shape[1]))
+        counts = np.zeros((n_groups, values.shape[1]), dtype=np.int64)
+        for i in range(codes.size):
+            group = codes[i]
+            if group < 0:  # missing key, dropped like groupby does
+                continue
+            for j in range(values.shape[1]):
+                value = values[i, j]
+                if not np.isnan(value):
+                    sums[group, j] += value
+                    counts[group, j] += 1
+        return sums, counts
+else:
+    _group_sums = None
+
+
+def _read_csv_fast(file_path: Path) -> pd.DataFrame:
+    """Read a CSV with the multithreaded pyarrow parser, falling back to the C engine."""
+    try:
+        return pd.read_csv(file_path, engine='pyarrow')
+    except (ImportError, ValueError):
+        # pyarrow missing, or the file uses something its parser rejects
+        return pd.read_csv(file_path)
+
+
+def _read_excel_fast(file_path: Path) -> pd.DataFrame:
+    """Read a modern Excel workbook with calamine, falling back to openpyxl."""
+    try:
+        return pd.read_excel(file_path, engine='calamine')
+    except (ImportError, ValueError):
+        # python-calamine not installed, or a workbook calamine can't parse
+        return pd.read_excel(file_path, engine='openpyxl')
+
+
+def _numeric_fraction(values: np.ndarray) -> float:
+    """Fraction of values that parse as numbers."""
+    return pd.notna(pd.to_numeric(values, errors='coerce')).mean()
+
+
+def _conditions_mask(df: pd.DataFrame, conditions: Dict[str, Any]) -> np.ndarray:
+    """Boolean mask of rows matching every condition on a column present in df."""
+    # Combine all conditions into one mask so the rows are sliced only once
+    mask = np.ones(len(df), dtype=bool)
+    
+    for column, value in conditions.items():
+        if column not in df.columns:
+            continue
+        
+        series = df[column]
+        wanted = value if isinstance(value, list) else [value]
+        
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Compare small integer codes instead of the category values
+            wanted_codes = series.cat.categories.get_indexer(wanted)
+            lookup = np.zeros(len(series.cat.categories) + 1, dtype=bool)
+            lookup[wanted_codes[wanted_codes >= 0]] = True
+            # Missing values have code -1, which lands on the trailing False slot
+            mask &= lookup[series.cat.codes.to_numpy()]
+        elif isinstance(value, list):
+            mask &= series.isin(value).to_numpy()
+        else:
+            mask &= (series == value).to_numpy(dtype=bool, na_value=False)
+    
+    return mask
+
+
+def read_sales_data(
+    file_path: Union[str, Path],
+    chunksize: Optional[int] = None,
+    filter_conditions: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
     """
     Read sales data from various file formats.
     
     Args:
-        file_path: Path to the data file (CSV, Excel, JSON)
+        file_path: Path to the data file (CSV, Excel, JSON, Parquet)
+        chunksize: For CSV files, parse this many rows at a time so that
+            only matching rows of each chunk are kept in memory
+        filter_conditions: Column:value pairs (as in `filter_data`) that
+            rows must match to be loaded
         
     Returns:
         DataFrame containing the sales data
@@ -26,17 +115,34 @@ def read_sales_data(file_path: Union[str, Path]) -> pd.DataFrame:
         raise FileNotFoundError(f"File not found: {file_path}")
     
     suffix = file_path.suffix.lower()
+    streamed = suffix == '.csv' and bool(chunksize)
     
     try:
-        if suffix == '.csv':
-            df = pd.read_csv(file_path)
-        elif suffix in ['.xlsx', '.xls']:
-            df = pd.read_excel(file_path)
+        if streamed:
+            # The pyarrow engine can't stream, so chunks use the C parser
+            chunks = []
+            with pd.read_csv(file_path, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    if filter_conditions:
+                        chunk = chunk[_conditions_mask(chunk, filter_conditions)]
+                    chunks.append(chunk)
+            df = pd.concat(chunks, ignore_index=True)
+        elif suffix == '.csv':
+            df = _read_csv_fast(file_path)
+        elif suffix in ['.xlsx', '.xlsm']:
+            df = _read_excel_fast(file_path)
+        elif suffix == '.xls':
+            df = pd.read_excel(file_path, engine='xlrd')
         elif suffix == '.json':
             df = pd.read_json(file_path)
+        elif suffix == '.parquet':
+            df = pd.read_parquet(file_path)
         else:
             raise ValueError(f"Unsupported file format: {suffix}")
         
+        if filter_conditions and not streamed:
+            df = df[_conditions_mask(df, filter_conditions)].reset_index(drop=True)
+        
         print(f"✅ Loaded {len(df)} rows from {file_path.name}")
         return df
         
@@ -44,6 +150,49 @@ def read_sales_data(file_path: Union[str, Path]) -> pd.DataFrame:
         raise ValueError(f"Error reading file {file_path}: {str(e)}")
 
 
+def clean_sales_data(
+    df: pd.DataFrame,
+    sample_size: int = 1000,
+    numeric_threshold: float = 1.0
+) -> pd.DataFrame:
+    """
+    Strip text columns and convert numeric text columns to numbers.
+    
+    A column is converted only if its non-empty values parse as numbers
+    and none is zero-padded (IDs and zip codes like '02134' stay text).
+    
+    Args:
+        df: Input DataFrame
+        sample_size: Number of non-empty values checked before parsing the whole column
+        numeric_threshold: Fraction of non-empty values that must parse as numbers
+        
+    Returns:
+        Cleaned DataFrame
+    """
+    df_clean = df.copy(deep=False)
+    
+    for column in df_clean.columns[df_clean.dtypes == object]:
+        stripped = df_clean[column].astype("string").str.strip()
+        values = stripped.to_numpy(dtype=object, na_value=np.nan)
+        present = (stripped != "").to_numpy(dtype=bool, na_value=False)
+        
+        df_clean[column] = stripped
+        
+        # The sample rules out most text columns before the full parse
+        sample = values[present][:sample_size]
+        if not len(sample) or _numeric_fraction(sample) < numeric_threshold:
+            continue
+        
+        numbers = pd.to_numeric(values, errors='coerce')
+        if (
+            pd.notna(numbers[present]).mean() >= numeric_threshold
+            and not stripped.str.contains(_ZERO_PADDED_RE, na=False).any()
+        ):
+            df_clean[column] = numbers
+    
+    return df_clean
+
+
 def filter_data(
     df: pd.DataFrame,
     conditions: Dict[str, Any]
@@ -61,22 +210,74 @@ def filter_data(
     Example:
         filter_data(df, {'Region': 'North', 'Product': 'Laptop'})
     """
-    filtered_df = df.copy()
-    
-    for column, value in conditions.items():
+    for column in conditions:
         if column not in df.columns:
             print(f"⚠️  Column '{column}' not found, skipping")
-            continue
-        
-        if isinstance(value, list):
-            filtered_df = filtered_df[filtered_df[column].isin(value)]
-        else:
-            filtered_df = filtered_df[filtered_df[column] == value]
+    
+    filtered_df = df[_conditions_mask(df, conditions)]
     
     print(f"✅ Filtered to {len(filtered_df)} rows (from {len(df)})")
     return filtered_df
 
 
+def _group_and_aggregate_fused(
+    df: pd.DataFrame,
+    key: str,
+    agg_dict: Dict[str, Union[str, List[str]]]
+) -> Optional[pd.DataFrame]:
+    """
+    Aggregate by a single key with the numba kernel.
+    
+    Args:
+        df: Input DataFrame
+        key: Column to group by
+        agg_dict: Dictionary of column:aggregation_function pairs
+        
+    Returns:
+        Grouped DataFrame in the same layout as `group_and_aggregate`, or
+        None if numba is unavailable or the aggregations aren't supported
+    """
+    if _group_sums is None:
+        return None
+    
+    specs = [
+        (col, [funcs] if isinstance(funcs, str) else list(funcs))
+        for col, funcs in agg_dict.items()
+    ]
+    for col, funcs in specs:
+        if col == key or not funcs or not set(funcs) <= _FUSED_AGGS:
+            return None
+        # Plain NumPy numbers only: nullable Int64/Float64 columns convert to
+        # object arrays (or fail on NA), so pandas handles those
+        dtype = df[col].dtype
+        if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+            return None
+    
+    codes, uniques = pd.factorize(df[key])
+    columns = [col for col, _ in specs]
+    values = np.column_stack([df[col].to_numpy(dtype=np.float64) for col in columns])
+    sums, counts = _group_sums(codes, values, len(uniques))
+    
+    multi = any(not isinstance(funcs, str) for funcs in agg_dict.values())
+    result = {key: uniques}
+    for j, (col, funcs) in enumerate(specs):
+        for func in funcs:
+            if func == 'sum':
+                out = sums[:, j]
+                # Widen like pandas does: int8 [100, 100, 100] sums to 300, not 44
+                kind = df[col].dtype.kind
+                if kind in 'iu':
+                    out = out.astype(np.int64 if kind == 'i' else np.uint64)
+            elif func == 'mean':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    out = sums[:, j] / counts[:, j]
+            else:
+                out = counts[:, j]
+            result[f'{col}_{func}' if multi else col] = out
+    
+    return pd.DataFrame(result)
+
+
 def group_and_aggregate(
     df: pd.DataFrame,
     group_by: Union[str, List[str]],
@@ -91,12 +292,34 @@ def group_and_aggregate(
         agg_dict: Dictionary of column:aggregation_function pairs
         
     Returns:
-        Grouped and aggregated DataFrame
+        Grouped and aggregated DataFrame, with groups in order of first appearance
         
     Example:
         group_and_aggregate(df, 'Product', {'Sales': 'sum', 'Quantity': 'mean'})
     """
-    grouped = df.groupby(group_by).agg(agg_dict).reset_index()
+    keys = [group_by] if isinstance(group_by, str) else list(group_by)
+    
+    # Numeric sum/mean/count by one key: a single compiled pass when numba is available
+    if len(keys) == 1:
+        fused = _group_and_aggregate_fused(df, keys[0], agg_dict)
+        if fused is not None:
+            print(f"✅ Grouped by {group_by}, resulting in {len(fused)} groups")
+            return fused
+    
+    # Group string keys by integer category codes instead of hashing each cell
+    # (on a shallow copy, so the caller's columns are untouched)
+    keyed = df.copy(deep=False)
+    for col in keys:
+        if keyed[col].dtype == object:
+            keyed[col] = keyed[col].astype('category')
+    
+    # as_index=False emits the keys as columns directly, no reset_index copy
+    grouped = keyed.groupby(keys, as_index=False, observed=True, sort=False).agg(agg_dict)
+    
+    # Hand back keys with their original dtype rather than categoricals
+    for col in keys:
+        if df[col].dtype == object:
+            grouped[col] = grouped[col].astype(object)
     
     # Flatten multi-level column names if any
     if isinstance(grouped.columns, pd.MultiIndex):
@@ -181,7 +404,13 @@ def calculate_insights(df: pd.DataFrame) -> Dict[str, Any]:
     
     if sales_cols:
         sales_col = sales_cols[0]
-        insights['total_sales'] = df[sales_col].sum()
+        sales_dtype = df[sales_col].dtype
+        if isinstance(sales_dtype, np.dtype) and sales_dtype.kind in 'iuf':
+            # Contiguous float64 lets NumPy use its vectorized reduction
+            sales = df[sales_col].to_numpy(dtype=np.float64, copy=False)
+            insights['total_sales'] = np.nansum(sales)
+        else:
+            insights['total_sales'] = df[sales_col].sum()
         insights['average_sales'] = df[sales_col].mean()
         insights['max_sales'] = df[sales_col].max()
         insights['min_sales'] = df[sales_col].min()
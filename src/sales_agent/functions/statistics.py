@@ -3,9 +3,40 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime
 import calendar
 
+try:
+    from numba import njit
+except ImportError:  # Optional: quarter sums fall back to NumPy masking
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _quarter_sum(values, months, months_mask):
+        """Sum values whose month is set in months_mask, skipping NaN, in one pass."""
+        total = 0.0
+        for i in range(values.size):
+            value = values[i]
+            if months_mask[months[i]] and not np.isnan(value):
+                total += value
+        return total
+else:
+    _quarter_sum = None
+
+
+def _ensure_datetime(df: pd.DataFrame, column: str) -> pd.Series:
+    """Return df[column] as datetime64, parsing it only if it isn't already."""
+    dates = df[column]
+    if dates.dtype.kind != 'M':
+        dates = pd.to_datetime(dates)
+    return dates
+
+
+def _month_numbers(dates: pd.Series) -> np.ndarray:
+    """Month number (1-12) of each date as int8, with 0 for NaT."""
+    return dates.dt.month.fillna(0).to_numpy(dtype=np.int8)
+
 
 def calculate_quarter_sales(
     df: pd.DataFrame,
@@ -29,22 +60,26 @@ def calculate_quarter_sales(
         calculate_quarter_sales(df, 'Sales', 'Date', [11, 12, 1])
     """
     # Ensure date column is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
-        df[date_column] = pd.to_datetime(df[date_column])
-    
-    # Ensure sales column is numeric
-    df = df.copy()  # Avoid SettingWithCopyWarning
-    df[sales_column] = pd.to_numeric(df[sales_column], errors='coerce').fillna(0)
-    
-    # Ensure sales column is numeric
-    df = df.copy()  # Avoid SettingWithCopyWarning
-    df[sales_column] = pd.to_numeric(df[sales_column], errors='coerce').fillna(0)
-    
-    # Filter by months
-    mask = df[date_column].dt.month.isin(months)
-    quarter_df = df[mask]
-    
-    total_sales = quarter_df[sales_column].sum()
+    dates = _ensure_datetime(df, date_column)
+    
+    # Ensure sales column is numeric (only coerce when it isn't already)
+    sales = df[sales_column]
+    if not pd.api.types.is_numeric_dtype(sales):
+        sales = pd.to_numeric(sales, errors='coerce')
+    
+    # Filter by months with a lookup table indexed by month number (0 = NaT).
+    # Months outside 1-12 match nothing, so they never select the NaT slot
+    months = [m for m in months if 1 <= m <= 12]
+    months_mask = np.zeros(13, dtype=bool)
+    months_mask[months] = True
+    month_numbers = _month_numbers(dates)
+    values = sales.to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    if _quarter_sum is not None:
+        total_sales = _quarter_sum(values, month_numbers, months_mask)
+    else:
+        # Plain ndarrays: no Series is built for the selected rows
+        total_sales = np.nansum(values[months_mask[month_numbers]])
     
     month_names = [calendar.month_abbr[m] for m in months]
     print(f"✅ Quarter sales ({', '.join(month_names)}): {total_sales:,.2f}")
@@ -72,11 +107,11 @@ def add_quarter_sales_column(
     Returns:
         DataFrame with new quarter sales column
     """
-    df_copy = df.copy()
+    # Only whole columns are assigned, so a shallow copy is enough
+    df_copy = df.copy(deep=False)
     
-    # Ensure date column is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df_copy[date_column]):
-        df_copy[date_column] = pd.to_datetime(df_copy[date_column])
+    # Parsed once here, so calculate_quarter_sales below skips the conversion
+    df_copy[date_column] = _ensure_datetime(df_copy, date_column)
     
     # Calculate total quarter sales
     quarter_total = calculate_quarter_sales(df_copy, sales_column, date_column, months)
@@ -109,8 +144,7 @@ def calculate_period_aggregation(
     """
     df_copy = df.copy()
     
-    if not pd.api.types.is_datetime64_any_dtype(df_copy[date_column]):
-        df_copy[date_column] = pd.to_datetime(df_copy[date_column])
+    df_copy[date_column] = _ensure_datetime(df_copy, date_column)
     
     df_copy = df_copy.set_index(date_column)
     aggregated = df_copy[value_column].resample(period).sum().reset_index()
@@ -125,7 +159,8 @@ def calculate_growth_rate(
     df: pd.DataFrame,
     value_column: str,
     date_column: str,
-    period: str = 'M'
+    period: str = 'M',
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Calculate growth rates (MoM, QoQ, YoY).
@@ -135,16 +170,17 @@ def calculate_growth_rate(
         value_column: Column to calculate growth for
         date_column: Date column
         period: 'M' for MoM, 'Q' for QoQ, 'Y' for YoY
+        inplace: If True, modify df directly instead of a copy
         
     Returns:
         DataFrame with growth rate column added
     """
-    df_copy = df.copy()
+    # Only columns are replaced below, so a shallow copy is enough
+    df_copy = df if inplace else df.copy(deep=False)
     
-    if not pd.api.types.is_datetime64_any_dtype(df_copy[date_column]):
-        df_copy[date_column] = pd.to_datetime(df_copy[date_column])
+    df_copy[date_column] = _ensure_datetime(df_copy, date_column)
     
-    df_copy = df_copy.sort_values(date_column)
+    df_copy.sort_values(date_column, inplace=True)
     
     # Calculate percentage change
     df_copy[f'{value_column}_Growth_%'] = df_copy[value_column].pct_change() * 100
@@ -169,16 +205,20 @@ def calculate_descriptive_stats(
     Returns:
         Dictionary of statistics
     """
+    # One describe() gives every moment and quartile; mode is computed once
+    summary = df[column].describe(percentiles=[0.25, 0.5, 0.75])
+    mode = df[column].mode()
+    
     stats = {
-        'mean': df[column].mean(),
-        'median': df[column].median(),
-        'mode': df[column].mode()[0] if not df[column].mode().empty else None,
-        'std_dev': df[column].std(),
-        'min': df[column].min(),
-        'max': df[column].max(),
-        'Q1': df[column].quantile(0.25),
-        'Q3': df[column].quantile(0.75),
-        'IQR': df[column].quantile(0.75) - df[column].quantile(0.25),
+        'mean': summary['mean'],
+        'median': summary['50%'],
+        'mode': mode.iloc[0] if not mode.empty else None,
+        'std_dev': summary['std'],
+        'min': summary['min'],
+        'max': summary['max'],
+        'Q1': summary['25%'],
+        'Q3': summary['75%'],
+        'IQR': summary['75%'] - summary['25%'],
     }
     
     return stats
@@ -187,7 +227,8 @@ def calculate_descriptive_stats(
 def calculate_moving_average(
     df: pd.DataFrame,
     column: str,
-    window: int = 3
+    window: int = 3,
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Calculate moving average.
@@ -196,11 +237,12 @@ def calculate_moving_average(
         df: Input DataFrame
         column: Column to calculate moving average for
         window: Window size (default: 3)
+        inplace: If True, modify df directly instead of a copy
         
     Returns:
         DataFrame with moving average column
     """
-    df_copy = df.copy()
+    df_copy = df if inplace else df.copy(deep=False)
     df_copy[f'{column}_MA_{window}'] = df_copy[column].rolling(window=window).mean()
     
     print(f"✅ {window}-period moving average calculated for '{column}'")
@@ -224,27 +266,34 @@ def detect_outliers(
     Returns:
         Tuple of (outliers DataFrame, clean DataFrame)
     """
+    if method not in ('iqr', 'zscore'):
+        raise ValueError("Method must be 'iqr' or 'zscore'")
+    
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    
     if method == 'iqr':
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
+        # Both quartiles in one selection pass (NaN skipped, like Series.quantile)
+        Q1, Q3 = np.nanquantile(values, [0.25, 0.75])
         IQR = Q3 - Q1
         
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
         
-        outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
-        clean = df[(df[column] >= lower_bound) & (df[column] <= upper_bound)]
+        outlier_mask = (values < lower_bound) | (values > upper_bound)
         
-    elif method == 'zscore':
-        from scipy import stats
-        z_scores = np.abs(stats.zscore(df[column]))
+    else:
+        # Population z-score (ddof=0, as scipy.stats.zscore) ignoring missing values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.abs((values - np.nanmean(values)) / np.nanstd(values))
         threshold = 3
         
-        outliers = df[z_scores > threshold]
-        clean = df[z_scores <= threshold]
+        outlier_mask = z_scores > threshold
     
-    else:
-        raise ValueError("Method must be 'iqr' or 'zscore'")
+    # Missing values are neither outliers nor clean
+    clean_mask = ~outlier_mask & ~np.isnan(values)
+    
+    outliers = df[outlier_mask]
+    clean = df[clean_mask]
     
     print(f"✅ Detected {len(outliers)} outliers using {method.upper()} method")
     
@@ -265,10 +314,19 @@ def calculate_correlation(
     Returns:
         Correlation matrix
     """
-    if columns:
-        corr_matrix = df[columns].corr()
+    numeric = df[columns] if columns else df.select_dtypes(include=[np.number])
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    if len(values) > 1 and not np.isnan(values).any():
+        # Whole matrix in one BLAS call; pandas would loop over column pairs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.corrcoef(values, rowvar=False)
+        corr_matrix = pd.DataFrame(
+            np.atleast_2d(corr), index=numeric.columns, columns=numeric.columns
+        )
     else:
-        corr_matrix = df.select_dtypes(include=[np.number]).corr()
+        # Missing values need pairwise deletion, which np.corrcoef can't do
+        corr_matrix = numeric.corr()
     
     print(f"✅ Correlation matrix calculated for {len(corr_matrix.columns)} columns")
     
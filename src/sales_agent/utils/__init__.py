@@ -5,6 +5,8 @@ from .config import (
     LLM_MODEL,
     LLM_TEMPERATURE,
     SUPPORTED_FORMATS,
+    Settings,
+    settings,
     validate_config,
 )
 
@@ -13,5 +15,7 @@ __all__ = [
     "LLM_MODEL",
     "LLM_TEMPERATURE",
     "SUPPORTED_FORMATS",
+    "Settings",
+    "settings",
     "validate_config",
 ]
@@ -1,66 +1,299 @@
+import ast
+import builtins
+import logging
+import re
+import types
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
+# Longest generated snippet accepted; larger input is rejected before parsing
+MAX_CODE_LEN = 8192
+
+# Warm worker processes that keep the current DataFrame between calls
+_POOL_WORKERS = 2
+_pool = None
+_pool_payloads = {}  # df_id -> pickled DataFrame, so each frame is serialized once
+
+# Worker-side state (lives in each pool process)
+_worker_frames = {}
+_MISSING_FRAME = "__missing_frame__"
+
+# Modules generated code may import (top-level package names)
+_ALLOWED_MODULES = frozenset({
+    "pandas", "numpy", "matplotlib", "seaborn", "math", "statistics",
+    "datetime", "collections", "itertools", "re"
+})
+# Modules generated code may not reach into, even as an attribute of an allowed
+# one (pandas and numpy hold references to os and io in their submodules)
+_BANNED_MODULES = frozenset({
+    "os", "sys", "subprocess", "shutil", "requests", "urllib", "socket",
+    "pathlib", "importlib", "builtins", "ctypes", "pickle", "io", "posix",
+    "nt", "runpy", "tempfile", "multiprocessing", "marshal", "shelve"
+})
+# Builtins that run arbitrary code, touch files/stdin, or bypass the checks below
+_BANNED_CALLS = frozenset({
+    "eval", "exec", "compile", "open", "input", "__import__",
+    "getattr", "setattr", "delattr", "globals", "locals", "vars", "breakpoint"
+})
+
+# One scan for any token the guard could object to; code without one skips the AST walk
+_RISKY_TOKENS_RE = re.compile(
+    r"import|__|\b(?:%s)\b" % "|".join(sorted(_BANNED_MODULES | _BANNED_CALLS))
+)
+
+class _UnsafeCode(Exception):
+    """Raised by _Guard at the first disallowed node."""
+
+class _Guard(ast.NodeVisitor):
+    """AST walker rejecting imports, calls and attributes that escape the sandbox."""
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.name.split(".")[0] not in _ALLOWED_MODULES:
+                raise _UnsafeCode(f"import {alias.name}")
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.level or node.module.split(".")[0] not in _ALLOWED_MODULES:
+            raise _UnsafeCode(f"from {'.' * node.level}{node.module or ''} import")
+        # The names count too: pandas.io.common re-exports os
+        for alias in node.names:
+            if alias.name in _BANNED_MODULES:
+                raise _UnsafeCode(f"from {node.module} import {alias.name}")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in _BANNED_CALLS:
+            raise _UnsafeCode(f"{node.func.id}()")
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        # Dunder attributes (__class__, __globals__, ...) are the usual escape route
+        if node.attr.startswith("__"):
+            raise _UnsafeCode(f".{node.attr}")
+        # Any segment of the chain counts: pd.io.common.os.getcwd() reaches os
+        segment = node
+        while isinstance(segment, ast.Attribute):
+            if segment.attr in _BANNED_MODULES:
+                raise _UnsafeCode(f".{segment.attr}")
+            segment = segment.value
+        if isinstance(segment, ast.Name) and segment.id in _BANNED_MODULES:
+            raise _UnsafeCode(f"{segment.id}.{node.attr}")
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if node.id == "__builtins__":
+            raise _UnsafeCode(node.id)
+
+@lru_cache(maxsize=256)
+def _parse(code: str) -> ast.Module:
+    """Parse code once; repeated snippets reuse the tree."""
+    return ast.parse(code, mode="exec")
+
 def unsafe_operations_check(code: str) -> bool:
     """
-    Basic check for unsafe operations in generated code.
+    Check generated code for unsafe operations by walking its syntax tree.
     Allowed: pandas, numpy, math operations, plotting.
-    Blocked: system calls, file deletions, network requests.
+    Blocked: system calls, file access, network requests, dynamic code execution.
+    Code longer than MAX_CODE_LEN is rejected without being parsed.
     """
-    unsafe_keywords = [
-        "os.", "sys.", "subprocess.", "eval(", "exec(", 
-        "open(", "import os", "import sys", "shutil", 
-        "requests.", "urllib.", "input("
-    ]
-    
-    for keyword in unsafe_keywords:
-        if keyword in code:
-            print(f"🚫 Secrity Alert: Code contains unsafe keyword '{keyword}'")
-            return False
+    # Deeply nested or huge input can exhaust the parser; analysis code is short
+    if len(code) > MAX_CODE_LEN:
+        logger.warning(
+            "🚫 Security Alert: Code is %d characters (limit %d)", len(code), MAX_CODE_LEN
+        )
+        return False
+
+    # Non-ASCII identifiers are NFKC-normalized by the parser (e.g. fullwidth
+    # letters become 'os'), so only ASCII source can be cleared by the regex
+    if code.isascii() and not _RISKY_TOKENS_RE.search(code):
+        return True
+
+    try:
+        tree = _parse(code)
+    except SyntaxError:
+        # Can't run either; let exec report the real error
+        return True
+
+    try:
+        _Guard().visit(tree)
+    except _UnsafeCode as e:
+        logger.warning("🚫 Security Alert: Code contains unsafe operation '%s'", e)
+        return False
     return True
 
-def execute_pandas_code(df: pd.DataFrame, code: str) -> Dict[str, Any]:
-    """
-    Execute generated Pandas code in a controlled environment.
-    
-    Args:
-        df: The pandas DataFrame to operate on (variable name 'df')
-        code: The python code string to execute
-        
-    Returns:
-        Dictionary containing results (text, dataframe, plot path)
-    """
-    if not unsafe_operations_check(code):
-        return {"success": False, "error": "Unsafe code detected"}
-        
-    # Local variables for execution
-    local_vars = {
+@lru_cache(maxsize=512)
+def _compile(code: str):
+    """Compile code once; repeated snippets skip tokenizing, parsing and compiling."""
+    return compile(_parse(code), "<llm_exec>", "exec")
+
+def _safe_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """__import__ for generated code: only allowed modules, checked at runtime too."""
+    if level or name.split(".")[0] not in _ALLOWED_MODULES:
+        raise ImportError(f"Import of '{name}' is not allowed")
+    module = builtins.__import__(name, globals, locals, fromlist, level)
+    # 'from X import y' hands back X.y, which may be a module from outside the allowlist
+    for attr in fromlist or ():
+        value = getattr(module, attr, None)
+        if attr in _BANNED_MODULES or (
+            isinstance(value, types.ModuleType)
+            and value.__name__.split(".")[0] not in _ALLOWED_MODULES
+        ):
+            raise ImportError(f"Import of '{attr}' from '{name}' is not allowed")
+    return module
+
+# Builtins visible to generated code: data handling only, no I/O or introspection
+_SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        "abs", "all", "any", "bool", "callable", "chr", "dict", "divmod",
+        "enumerate", "filter", "float", "format", "frozenset", "hasattr", "int",
+        "isinstance", "issubclass", "iter", "len", "list", "map", "max", "min",
+        "next", "object", "ord", "pow", "print", "range", "repr", "reversed",
+        "round", "set", "slice", "sorted", "str", "sum", "super", "tuple",
+        "type", "zip", "True", "False", "None", "__build_class__",
+        "Exception", "ArithmeticError", "AttributeError", "IndexError",
+        "KeyError", "RuntimeError", "StopIteration", "TypeError", "ValueError",
+        "ZeroDivisionError",
+    )
+}
+_SAFE_BUILTINS["__import__"] = _safe_import
+_SAFE_GLOBALS = {"__builtins__": _SAFE_BUILTINS, "__name__": "__llm__"}
+
+def _warm_imports():
+    """Pool initializer: pay the plotting import cost once per worker."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import seaborn  # noqa: F401
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Create the worker pool on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=_POOL_WORKERS, initializer=_warm_imports)
+    return _pool
+
+def _reset_pool():
+    """Drop a broken pool so the next call starts fresh workers."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False)
+    _pool = None
+
+def _run_code(df: pd.DataFrame, code: str) -> Dict[str, Any]:
+    """Execute code against df in the current process."""
+    # One namespace for the run: lambdas and comprehensions look names up in
+    # globals, so df, pd and np must not live in a separate locals dict
+    namespace = {
+        **_SAFE_GLOBALS,
         "df": df,
         "pd": pd,
         "np": np,
-        "plt": plt,
-        "sns": sns,
         "result": None
     }
-    
+
+    # Plotting libraries are slow to import; only load them for code that plots
+    if "plt" in code or "sns" in code:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        namespace["plt"] = plt
+        namespace["sns"] = sns
+
     try:
-        # Execute the code
-        exec(code, {}, local_vars)
-        
+        # Execute the code (fresh namespace so snippets can't leak state into each other)
+        exec(_compile(code), namespace)
+
         # Capture result
-        result = local_vars.get("result")
-        
+        result = namespace.get("result")
+        new_df = namespace.get("df")
+
         return {
             "success": True,
             "result": result,
-            "modified_df": local_vars.get("df") # In case df was modified
+            # Only when df was rebound; in-place edits already show in the caller's frame
+            "modified_df": new_df if new_df is not df else None
         }
-        
+
     except Exception as e:
         return {
-            "success": False, 
+            "success": False,
             "error": str(e)
         }
+
+def _run_in_worker(df_id: str, payload: Optional[bytes], code: str) -> Dict[str, Any]:
+    """Pool task: run code against the worker's cached copy of the DataFrame."""
+    df = _worker_frames.get(df_id)
+    if df is None:
+        if payload is None:
+            return {"success": False, "error": _MISSING_FRAME}
+        df = pickle.loads(payload)
+        # Only the active frame is kept per worker
+        _worker_frames.clear()
+        _worker_frames[df_id] = df
+
+    # Work on a copy so the cached frame keeps matching df_id
+    work = df.copy()
+    exec_result = _run_code(work, code)
+    if exec_result["success"]:
+        # Shipping a frame back is as costly as shipping it out, so only do it
+        # when the code rebound df or edited it in place (values, labels, dtypes or rows)
+        rebound = exec_result["modified_df"]
+        if rebound is not None:
+            if isinstance(rebound, pd.DataFrame) and rebound.equals(df):
+                exec_result["modified_df"] = None
+        elif not work.equals(df):
+            exec_result["edited_df"] = work
+    return exec_result
+
+def _execute_in_pool(df: pd.DataFrame, code: str, df_id: str) -> Dict[str, Any]:
+    """Run code in the worker pool, sending the DataFrame only to workers lacking it."""
+    pool = _get_pool()
+    exec_result = pool.submit(_run_in_worker, df_id, None, code).result()
+    if exec_result.get("error") == _MISSING_FRAME:
+        payload = _pool_payloads.get(df_id)
+        if payload is None:
+            _pool_payloads.clear()
+            payload = _pool_payloads[df_id] = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        exec_result = pool.submit(_run_in_worker, df_id, payload, code).result()
+    return exec_result
+
+def execute_pandas_code(df: pd.DataFrame, code: str, df_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Execute generated Pandas code in a controlled environment.
+
+    Args:
+        df: The pandas DataFrame to operate on (variable name 'df')
+        code: The python code string to execute
+        df_id: Stable identifier for df (e.g. its fingerprint). When given,
+            the code runs in a warm worker process that caches df by this id;
+            otherwise it runs in the current process.
+
+    Returns:
+        Dictionary containing results (text, dataframe, plot path).
+        modified_df is the new frame if the code reassigned df, else None
+        (a worker also returns None when the new frame equals df).
+        In-place edits made in a worker don't reach the caller's df, so
+        when the code changed it the edited frame is returned as edited_df.
+    """
+    if not unsafe_operations_check(code):
+        return {"success": False, "error": "Unsafe code detected"}
+
+    if df_id is not None:
+        try:
+            return _execute_in_pool(df, code, df_id)
+        except BrokenProcessPool as e:
+            logger.warning("⚠️  Worker pool failed (%s), running in-process", e)
+            _reset_pool()
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            # Result (e.g. a Figure) can't cross processes; run locally instead
+            logger.warning("⚠️  Result not transferable (%s), running in-process", e)
+
+    return _run_code(df, code)
@@ -1,11 +1,27 @@
 """Configuration management for the multi-agent sales analysis system."""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
+# Set once .env has been loaded; inherited by worker processes so they skip it
+_ENV_LOADED_FLAG = "_SALES_AGENT_ENV_LOADED"
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Load the .env file once per process tree."""
+    if not os.environ.get(_ENV_LOADED_FLAG):
+        load_dotenv()
+        os.environ[_ENV_LOADED_FLAG] = "1"
+    return True
+
+
 # Load environment variables
-load_dotenv()
+_load_env()
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
@@ -16,36 +32,77 @@ TEMP_DIR = BASE_DIR / "temp_downloads"
 CREDENTIALS_DIR.mkdir(exist_ok=True)
 TEMP_DIR.mkdir(exist_ok=True)
 
-# API Keys
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-if not GOOGLE_API_KEY and not GROQ_API_KEY:
-    print("⚠️  Warning: Neither GOOGLE_API_KEY nor GROQ_API_KEY found in .env file")
+@dataclass(frozen=True)
+class Settings:
+    """Environment-derived settings, read once at import."""
+    
+    # API Keys
+    GOOGLE_API_KEY: Optional[str]
+    GROQ_API_KEY: Optional[str]
+    
+    # Google Drive settings
+    GOOGLE_DRIVE_CREDENTIALS_PATH: str
+    
+    # AWS S3 settings (optional)
+    AWS_ACCESS_KEY_ID: Optional[str]
+    AWS_SECRET_ACCESS_KEY: Optional[str]
+    AWS_DEFAULT_REGION: str
+    
+    # Application settings
+    MAX_FILE_SIZE_MB: int
+    TEMP_DOWNLOAD_DIR: str
+    
+    # LLM settings
+    LLM_PROVIDER: str  # 'groq' or 'gemini'
+    LLM_MODEL: str
+    
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Read every setting from the environment in one place."""
+        env = os.environ
+        provider = env.get("LLM_PROVIDER", "groq")
+        return cls(
+            GOOGLE_API_KEY=env.get("GOOGLE_API_KEY"),
+            GROQ_API_KEY=env.get("GROQ_API_KEY"),
+            GOOGLE_DRIVE_CREDENTIALS_PATH=env.get(
+                "GOOGLE_DRIVE_CREDENTIALS_PATH",
+                str(CREDENTIALS_DIR / "credentials.json")
+            ),
+            AWS_ACCESS_KEY_ID=env.get("AWS_ACCESS_KEY_ID"),
+            AWS_SECRET_ACCESS_KEY=env.get("AWS_SECRET_ACCESS_KEY"),
+            AWS_DEFAULT_REGION=env.get("AWS_DEFAULT_REGION", "us-east-1"),
+            MAX_FILE_SIZE_MB=int(env.get("MAX_FILE_SIZE_MB", "100")),
+            TEMP_DOWNLOAD_DIR=env.get("TEMP_DOWNLOAD_DIR", str(TEMP_DIR)),
+            LLM_PROVIDER=provider,
+            LLM_MODEL=env.get(
+                "LLM_MODEL", "llama-3.3-70b-versatile" if provider == "groq" else "gemini-pro"
+            ),
+        )
+
 
-# Google Drive settings
-GOOGLE_DRIVE_CREDENTIALS_PATH = os.getenv(
-    "GOOGLE_DRIVE_CREDENTIALS_PATH",
-    str(CREDENTIALS_DIR / "credentials.json")
-)
+settings = Settings.from_env()
 
-# AWS S3 settings (optional)
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
+# Module-level names kept for existing imports
+GOOGLE_API_KEY = settings.GOOGLE_API_KEY
+GROQ_API_KEY = settings.GROQ_API_KEY
 
-# Application settings
-MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "100"))
-TEMP_DOWNLOAD_DIR = os.getenv("TEMP_DOWNLOAD_DIR", str(TEMP_DIR))
+if not GOOGLE_API_KEY and not GROQ_API_KEY:
+    print("⚠️  Warning: Neither GOOGLE_API_KEY nor GROQ_API_KEY found in .env file")
 
-# LLM settings
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # 'groq' or 'gemini'
-LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile" if LLM_PROVIDER == "groq" else "gemini-pro")
+GOOGLE_DRIVE_CREDENTIALS_PATH = settings.GOOGLE_DRIVE_CREDENTIALS_PATH
+AWS_ACCESS_KEY_ID = settings.AWS_ACCESS_KEY_ID
+AWS_SECRET_ACCESS_KEY = settings.AWS_SECRET_ACCESS_KEY
+AWS_DEFAULT_REGION = settings.AWS_DEFAULT_REGION
+MAX_FILE_SIZE_MB = settings.MAX_FILE_SIZE_MB
+TEMP_DOWNLOAD_DIR = settings.TEMP_DOWNLOAD_DIR
+LLM_PROVIDER = settings.LLM_PROVIDER
+LLM_MODEL = settings.LLM_MODEL
 LLM_TEMPERATURE = 0.1
 LLM_MAX_TOKENS = 2048
 
 # Supported file formats
-SUPPORTED_FORMATS = [".csv", ".xlsx", ".xls", ".json"]
+SUPPORTED_FORMATS = [".csv", ".xlsx", ".xlsm", ".xls", ".json", ".parquet"]
 
 
 def validate_config():
@@ -1,11 +1,27 @@
 """Conversation state management for multi-agent orchestration."""
 
-from typing import Optional, Dict, Any, List
+import sys
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List, Deque
 from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+# Messages kept in memory; older turns are dropped
+MAX_MESSAGES = 200
+
+
+def _estimate_tokens(content: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(content) // 4
+
+
+# __slots__ instead of a per-instance __dict__ (dataclass slots needs Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ConversationState:
     """Tracks the state of the conversation across agents."""
     
@@ -26,44 +42,106 @@ class ConversationState:
     results: Dict[str, Any] = field(default_factory=dict)
     output_file_path: Optional[str] = None
     
-    # Conversation history
-    messages: List[Dict[str, str]] = field(default_factory=list)
+    # Conversation history, one column per message attribute
+    _roles: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=MAX_MESSAGES), init=False, repr=False
+    )
+    _contents: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=MAX_MESSAGES), init=False, repr=False
+    )
+    _timestamps: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=MAX_MESSAGES), init=False, repr=False
+    )
+    _token_estimate: int = field(default=0, init=False, repr=False)
     
-    # Metadata
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    # Metadata (epoch seconds; see updated_at_dt / updated_at_iso for display)
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     
     def add_message(self, role: str, content: str):
         """Add a message to conversation history."""
-        self.messages.append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat()
-        })
-        self.updated_at = datetime.now()
+        if len(self._contents) == self._contents.maxlen:
+            # Oldest message is about to be evicted
+            self._token_estimate -= _estimate_tokens(self._contents[0])
+        self._token_estimate += _estimate_tokens(content)
+        self._roles.append(role)
+        self._contents.append(content)
+        now = time.time()
+        self._timestamps.append(now)
+        self.updated_at = now
+    
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """Conversation history as role/content/timestamp (epoch seconds) dicts, oldest first."""
+        return [
+            {"role": role, "content": content, "timestamp": timestamp}
+            for role, content, timestamp in zip(self._roles, self._contents, self._timestamps)
+        ]
+    
+    @property
+    def updated_at_dt(self) -> datetime:
+        """Last update time as a datetime."""
+        return datetime.fromtimestamp(self.updated_at)
+    
+    def updated_at_iso(self) -> str:
+        """Last update time as an ISO 8601 string, for logs and exports."""
+        return self.updated_at_dt.isoformat()
+    
+    def iso_timestamps(self) -> List[str]:
+        """Message timestamps as ISO 8601 strings, oldest first, for exports."""
+        return [datetime.fromtimestamp(t).isoformat() for t in self._timestamps]
+    
+    @property
+    def token_estimate(self) -> int:
+        """Approximate token count of the retained messages."""
+        return self._token_estimate
+    
+    def recent_messages(self, token_budget: int) -> List[Dict[str, Any]]:
+        """
+        Get the most recent messages that fit within a token budget.
+        
+        Args:
+            token_budget: Maximum approximate tokens to return
+            
+        Returns:
+            Messages in chronological order
+        """
+        # Walk back from the newest message so only the returned tail is visited
+        recent = []
+        used = 0
+        for role, content, timestamp in zip(
+            reversed(self._roles), reversed(self._contents), reversed(self._timestamps)
+        ):
+            used += _estimate_tokens(content)
+            if used > token_budget:
+                break
+            recent.append({"role": role, "content": content, "timestamp": timestamp})
+        
+        recent.reverse()
+        return recent
     
     def set_data_source(self, source: str, path: str):
         """Set data source information."""
         self.data_source = source
         self.data_path = path
-        self.updated_at = datetime.now()
+        self.updated_at = time.time()
     
     def set_downloaded_file(self, file_path: str):
         """Record downloaded file path."""
         self.downloaded_file_path = file_path
         self.dataframe_loaded = True
-        self.updated_at = datetime.now()
+        self.updated_at = time.time()
     
     def set_results(self, results: Dict[str, Any]):
         """Store analysis results."""
         self.results = results
         self.analysis_complete = True
-        self.updated_at = datetime.now()
+        self.updated_at = time.time()
     
     def set_output_file(self, file_path: str):
         """Record output file path."""
         self.output_file_path = file_path
-        self.updated_at = datetime.now()
+        self.updated_at = time.time()
     
     def is_complete(self) -> bool:
         """Check if conversation is complete."""
@@ -81,5 +159,5 @@ class ConversationState:
             "data_loaded": self.dataframe_loaded,
             "analysis_complete": self.analysis_complete,
             "output_file": self.output_file_path,
-            "messages_count": len(self.messages),
+            "messages_count": len(self._roles),
         }
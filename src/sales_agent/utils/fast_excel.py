@@ -0,0 +1,51 @@
+"""Fast Excel writers for analysis results."""
+
+from pathlib import Path
+from typing import Union
+
+import pandas as pd
+
+try:
+    from pyexcelerate import Workbook
+except ImportError:  # Optional: falls back to xlsxwriter
+    Workbook = None
+
+
+def save_df(
+    df: pd.DataFrame,
+    file_path: Union[str, Path],
+    sheet_name: str = 'Sheet1'
+) -> str:
+    """
+    Write a DataFrame to a new, unformatted Excel file as fast as possible.
+
+    Uses pyexcelerate when installed and the frame has no datetime columns,
+    otherwise pandas with the xlsxwriter engine. Neither preserves existing
+    workbook formatting; use `data_manipulation.write_to_excel` to update
+    an existing workbook.
+
+    Args:
+        df: DataFrame to write
+        file_path: Path to output Excel file
+        sheet_name: Name of the sheet (default: 'Sheet1')
+
+    Returns:
+        Path to written file
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # pyexcelerate writes dates as bare serial numbers, so only use it without them
+    has_dates = any(pd.api.types.is_datetime64_any_dtype(t) for t in df.dtypes)
+
+    if Workbook is not None and not has_dates:
+        # pyexcelerate cannot serialize NaN, so write blanks instead
+        data = df.astype(object).where(df.notna(), None)
+        wb = Workbook()
+        wb.new_sheet(sheet_name, data=[df.columns.tolist()] + data.values.tolist())
+        wb.save(str(file_path))
+    else:
+        df.to_excel(file_path, sheet_name=sheet_name, index=False, engine='xlsxwriter')
+
+    print(f"✅ Written {len(df)} rows to '{file_path.name}'")
+    return str(file_path)
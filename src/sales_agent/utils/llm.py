@@ -0,0 +1,93 @@
+"""Shared LLM client for the analysis agents."""
+
+from functools import lru_cache
+
+from sales_agent.utils.config import (
+    GOOGLE_API_KEY, GROQ_API_KEY,
+    LLM_MODEL, LLM_PROVIDER
+)
+
+# Keep-alive connections shared by every conversation's requests
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+# Model families whose provider reuses a cached prompt prefix across requests
+_PREFIX_CACHING_MODELS = ("gemini-2.5", "gemini-3", "openai/gpt-oss", "moonshotai/kimi-k2")
+
+
+def supports_prefix_caching() -> bool:
+    """Check whether the configured model caches repeated prompt prefixes."""
+    return any(family in LLM_MODEL for family in _PREFIX_CACHING_MODELS)
+
+
+def max_tokens_kwargs(max_tokens: int) -> dict:
+    """Per-call output token limit, under the configured provider's parameter name."""
+    if LLM_PROVIDER == "groq":
+        return {"max_tokens": max_tokens}
+    return {"max_output_tokens": max_tokens}
+
+
+def create_llm():
+    """
+    Create a new chat model for the configured provider.
+
+    Use this, not get_llm(), for async calls (ainvoke/abatch): the
+    provider's async HTTP client is bound to the event loop it first runs
+    on, so it must not outlive that loop.
+
+    Returns:
+        ChatGroq or ChatGoogleGenerativeAI instance
+
+    Raises:
+        ValueError: If the API key for the configured provider is missing
+    """
+    # Provider SDKs are slow to import, so load only the one in use
+    if LLM_PROVIDER == "groq":
+        import httpx
+        from langchain_groq import ChatGroq
+
+        if not GROQ_API_KEY:
+            raise ValueError("GROQ_API_KEY is not set.")
+        # Only the sync client is pooled; the async side stays per-instance
+        llm = ChatGroq(
+            model_name=LLM_MODEL,
+            groq_api_key=GROQ_API_KEY,
+            temperature=0,  # Zero temperature for precise code generation
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+            )
+        )
+        print(f"Initialized Groq LLM: {LLM_MODEL} (Code Gen Mode)")
+
+    else:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        if not GOOGLE_API_KEY:
+            raise ValueError("GOOGLE_API_KEY is not set.")
+        llm = ChatGoogleGenerativeAI(
+            model=LLM_MODEL,
+            google_api_key=GOOGLE_API_KEY,
+            temperature=0
+        )
+        print(f"Initialized Gemini LLM: {LLM_MODEL} (Code Gen Mode)")
+
+    return llm
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Get the chat model shared by the whole process.
+
+    Reusing the client keeps its HTTP connections alive across
+    conversations instead of repeating TLS and auth setup. Only call its
+    synchronous methods (invoke, stream, batch); batch() already runs
+    requests concurrently on a thread pool. Async callers need their own
+    client from create_llm().
+
+    Returns:
+        ChatGroq or ChatGoogleGenerativeAI instance
+
+    Raises:
+        ValueError: If the API key for the configured provider is missing
+    """
+    return create_llm()
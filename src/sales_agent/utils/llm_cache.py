@@ -0,0 +1,79 @@
+"""In-memory cache for LLM responses keyed by query and DataFrame fingerprint."""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+
+def dataframe_fingerprint(df) -> str:
+    """
+    Compute a content hash for a DataFrame.
+
+    Args:
+        df: DataFrame to fingerprint
+
+    Returns:
+        Hex digest identifying the DataFrame's values, index, column names and dtypes
+    """
+    import pandas as pd
+    hashed = pd.util.hash_pandas_object(df, index=True).values
+    digest = hashlib.md5(hashed.tobytes())
+    # Row hashes ignore column labels, so a rename would otherwise keep the fingerprint
+    digest.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    return digest.hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries match."""
+    return " ".join(query.lower().split())
+
+
+def make_cache_key(df_fingerprint: str, query: str, context: Sequence[str] = ()) -> str:
+    """
+    Build the cache key for a query against a specific DataFrame.
+
+    Args:
+        df_fingerprint: Fingerprint from `dataframe_fingerprint`
+        query: Raw user query
+        context: Earlier queries the answer depends on (for follow-ups)
+
+    Returns:
+        Cache key string
+    """
+    parts = [df_fingerprint, *(normalize_query(q) for q in context), normalize_query(query)]
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+class InMemoryCache:
+    """Bounded LRU cache for generated code and other per-DataFrame results."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the oldest
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
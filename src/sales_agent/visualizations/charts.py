@@ -1,16 +1,90 @@
 """Visualization module for creating charts and plots."""
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import threading
 import pandas as pd
 import numpy as np
-from pathlib import Path
-from typing import Optional, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, List, Union, Callable, Dict, Any, Tuple
 
 
-# Set seaborn style for better-looking plots
-sns.set_style("whitegrid")
-sns.set_palette("husl")
+# Saved chart resolution; PNG encode time grows with dpi squared
+DEFAULT_DPI = 150
+
+# Reusable figures for saved charts, per thread so render_all can draw concurrently
+_local = threading.local()
+
+@lru_cache(maxsize=1)
+def _plotting():
+    """
+    Import matplotlib and seaborn on first use.
+    
+    Importing them is slow and memory-hungry, so callers that never draw
+    a chart don't pay for it.
+    
+    Returns:
+        Tuple of (matplotlib.pyplot, seaborn) with the chart style applied
+    """
+    import matplotlib
+    
+    # Charts are rendered to files: use the non-GUI Agg backend unless the
+    # user picked one (e.g. MPLBACKEND=TkAgg to display charts interactively)
+    if not os.environ.get('MPLBACKEND'):
+        matplotlib.use('Agg')
+    
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # Set seaborn style for better-looking plots
+    sns.set_style("whitegrid")
+    sns.set_palette("husl")
+    
+    return plt, sns
+
+
+@lru_cache(maxsize=None)
+def _palette(n: int) -> tuple:
+    """The 'husl' palette with n colors, built once per size."""
+    _, sns = _plotting()
+    return tuple(sns.color_palette('husl', n))
+
+
+def _figure(figsize: tuple, interactive: bool = False):
+    """
+    Get a cleared figure of this size with a single axes.
+    
+    Figures use constrained layout, which places the axes, labels and
+    legend while the figure is drawn, so saving needs neither
+    tight_layout() nor bbox_inches='tight' (which renders twice).
+    
+    Saved charts reuse a figure owned by the calling thread and created
+    without pyplot, so concurrent renders never share state. Charts that
+    are shown interactively get a new pyplot figure.
+    
+    Args:
+        figsize: Figure size in inches (width, height)
+        interactive: True if the chart will be displayed with plt.show()
+        
+    Returns:
+        Tuple of (Figure, Axes)
+    """
+    plt, _ = _plotting()
+    if interactive:
+        fig = plt.figure(figsize=figsize, layout='constrained')
+        return fig, fig.add_subplot()
+    
+    figures = getattr(_local, 'figures', None)
+    if figures is None:
+        figures = _local.figures = {}
+    
+    fig = figures.get(figsize)
+    if fig is None:
+        from matplotlib.figure import Figure
+        fig = figures[figsize] = Figure(figsize=figsize, layout='constrained')
+    else:
+        fig.clear()
+    return fig, fig.add_subplot()
 
 
 def create_box_plot(
@@ -18,7 +92,8 @@ def create_box_plot(
     column: str,
     group_by: Optional[str] = None,
     title: Optional[str] = None,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    dpi: int = DEFAULT_DPI
 ) -> str:
     """
     Create a box plot for distribution analysis.
@@ -29,24 +104,24 @@ def create_box_plot(
         group_by: Optional column to group by
         title: Plot title
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
         
     Returns:
         Path to saved plot
     """
-    plt.figure(figsize=(10, 6))
+    plt, sns = _plotting()
+    fig, ax = _figure((10, 6), interactive=not save_path)
     
     if group_by:
-        sns.boxplot(data=df, x=group_by, y=column)
-        plt.xticks(rotation=45, ha='right')
+        sns.boxplot(data=df, x=group_by, y=column, ax=ax)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
     else:
-        sns.boxplot(data=df, y=column)
+        sns.boxplot(data=df, y=column, ax=ax)
     
-    plt.title(title or f'Box Plot: {column}')
-    plt.tight_layout()
+    ax.set_title(title or f'Box Plot: {column}')
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=dpi)
         print(f"✅ Box plot saved: {save_path}")
         return save_path
     else:
@@ -60,7 +135,8 @@ def create_scatter_plot(
     y_column: str,
     hue: Optional[str] = None,
     title: Optional[str] = None,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    dpi: int = DEFAULT_DPI
 ) -> str:
     """
     Create a scatter plot for correlation visualization.
@@ -72,22 +148,25 @@ def create_scatter_plot(
         hue: Optional column for color coding
         title: Plot title
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
         
     Returns:
         Path to saved plot
     """
-    plt.figure(figsize=(10, 6))
+    plt, sns = _plotting()
+    fig, ax = _figure((10, 6), interactive=not save_path)
     
-    sns.scatterplot(data=df, x=x_column, y=y_column, hue=hue, s=100, alpha=0.6)
+    # Rasterize the points so vector outputs (PDF/SVG) stay small for large frames
+    sns.scatterplot(
+        data=df, x=x_column, y=y_column, hue=hue, s=100, alpha=0.6, rasterized=True, ax=ax
+    )
     
-    plt.xlabel(x_column)
-    plt.ylabel(y_column)
-    plt.title(title or f'{y_column} vs {x_column}')
-    plt.tight_layout()
+    ax.set_xlabel(x_column)
+    ax.set_ylabel(y_column)
+    ax.set_title(title or f'{y_column} vs {x_column}')
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=dpi)
         print(f"✅ Scatter plot saved: {save_path}")
         return save_path
     else:
@@ -101,7 +180,8 @@ def create_bar_chart(
     y_column: str,
     horizontal: bool = False,
     title: Optional[str] = None,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    dpi: int = DEFAULT_DPI
 ) -> str:
     """
     Create a bar chart for categorical comparisons.
@@ -113,26 +193,26 @@ def create_bar_chart(
         horizontal: If True, create horizontal bar chart
         title: Plot title
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
         
     Returns:
         Path to saved plot
     """
-    plt.figure(figsize=(12, 6))
+    plt, sns = _plotting()
+    fig, ax = _figure((12, 6), interactive=not save_path)
     
     if horizontal:
-        sns.barplot(data=df, y=x_column, x=y_column, orient='h')
+        sns.barplot(data=df, y=x_column, x=y_column, orient='h', ax=ax)
     else:
-        sns.barplot(data=df, x=x_column, y=y_column)
-        plt.xticks(rotation=45, ha='right')
+        sns.barplot(data=df, x=x_column, y=y_column, ax=ax)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
     
-    plt.xlabel(y_column if horizontal else x_column)
-    plt.ylabel(x_column if horizontal else y_column)
-    plt.title(title or f'{y_column} by {x_column}')
-    plt.tight_layout()
+    ax.set_xlabel(y_column if horizontal else x_column)
+    ax.set_ylabel(x_column if horizontal else y_column)
+    ax.set_title(title or f'{y_column} by {x_column}')
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=dpi)
         print(f"✅ Bar chart saved: {save_path}")
         return save_path
     else:
@@ -145,7 +225,8 @@ def create_pie_chart(
     labels_column: str,
     values_column: str,
     title: Optional[str] = None,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    dpi: int = DEFAULT_DPI
 ) -> str:
     """
     Create a pie chart for proportion visualization.
@@ -156,39 +237,47 @@ def create_pie_chart(
         values_column: Column for slice values
         title: Plot title
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
         
     Returns:
         Path to saved plot
     """
-    plt.figure(figsize=(10, 8))
+    plt, sns = _plotting()
+    fig, ax = _figure((10, 8), interactive=not save_path)
+    
+    # Plain arrays: slices are gathered with a NumPy take, not the pandas indexer
+    all_labels = df[labels_column].to_numpy()
+    all_values = df[values_column].to_numpy(dtype=np.float64, na_value=np.nan)
     
     # Aggregate data
     if len(df) > 10:
         # Take top 9 and group rest as "Others"
-        df_sorted = df.nlargest(9, values_column)
-        others_value = df[~df.index.isin(df_sorted.index)][values_column].sum()
+        # Linear-time top 9 (missing values never make the cut), then order them
+        ranked = np.where(np.isnan(all_values), -np.inf, all_values)
+        top = np.argpartition(ranked, -9)[-9:]
+        top = top[np.argsort(ranked[top])[::-1]]
+        top_values = all_values[top]
+        others_value = np.nansum(all_values) - np.nansum(top_values)
         
-        labels = df_sorted[labels_column].tolist() + ['Others']
-        values = df_sorted[values_column].tolist() + [others_value]
+        labels = all_labels[top].tolist() + ['Others']
+        values = top_values.tolist() + [float(others_value)]
     else:
-        labels = df[labels_column].tolist()
-        values = df[values_column].tolist()
+        labels = all_labels.tolist()
+        values = all_values.tolist()
     
-    plt.pie(
+    ax.pie(
         values,
         labels=labels,
         autopct='%1.1f%%',
         startangle=90,
-        colors=sns.color_palette('husl', len(labels))
+        colors=_palette(len(labels))
     )
     
-    plt.title(title or f'{values_column} Distribution')
-    plt.axis('equal')
-    plt.tight_layout()
+    ax.set_title(title or f'{values_column} Distribution')
+    ax.axis('equal')
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=dpi)
         print(f"✅ Pie chart saved: {save_path}")
         return save_path
     else:
@@ -201,7 +290,8 @@ def create_line_chart(
     x_column: str,
     y_column: Union[str, List[str]],
     title: Optional[str] = None,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    dpi: int = DEFAULT_DPI
 ) -> str:
     """
     Create a line chart for time series or trend visualization.
@@ -212,29 +302,29 @@ def create_line_chart(
         y_column: Column(s) for y-axis (can be list for multiple lines)
         title: Plot title
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
         
     Returns:
         Path to saved plot
     """
-    plt.figure(figsize=(12, 6))
+    plt, sns = _plotting()
+    fig, ax = _figure((12, 6), interactive=not save_path)
     
     if isinstance(y_column, list):
         for col in y_column:
-            plt.plot(df[x_column], df[col], marker='o', label=col, linewidth=2)
-        plt.legend()
+            ax.plot(df[x_column], df[col], marker='o', label=col, linewidth=2)
+        ax.legend()
     else:
-        plt.plot(df[x_column], df[y_column], marker='o', linewidth=2, markersize=6)
+        ax.plot(df[x_column], df[y_column], marker='o', linewidth=2, markersize=6)
     
-    plt.xlabel(x_column)
-    plt.ylabel(y_column if isinstance(y_column, str) else 'Values')
-    plt.title(title or f'{y_column} over {x_column}')
-    plt.xticks(rotation=45, ha='right')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
+    ax.set_xlabel(x_column)
+    ax.set_ylabel(y_column if isinstance(y_column, str) else 'Values')
+    ax.set_title(title or f'{y_column} over {x_column}')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.grid(True, alpha=0.3)
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=dpi)
         print(f"✅ Line chart saved: {save_path}")
         return save_path
     else:
@@ -245,7 +335,8 @@ def create_line_chart(
 def create_heatmap(
     df: pd.DataFrame,
     title: Optional[str] = None,
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    dpi: int = DEFAULT_DPI
 ) -> str:
     """
     Create a heatmap (usually for correlation matrix).
@@ -254,11 +345,13 @@ def create_heatmap(
         df: Input DataFrame (correlation matrix or pivot table)
         title: Plot title
         save_path: Path to save the plot
+        dpi: Resolution of the saved image
         
     Returns:
         Path to saved plot
     """
-    plt.figure(figsize=(10, 8))
+    plt, sns = _plotting()
+    fig, ax = _figure((10, 8), interactive=not save_path)
     
     sns.heatmap(
         df,
@@ -267,15 +360,14 @@ def create_heatmap(
         cmap='coolwarm',
         center=0,
         linewidths=0.5,
-        cbar_kws={'label': 'Correlation'}
+        cbar_kws={'label': 'Correlation'},
+        ax=ax
     )
     
-    plt.title(title or 'Correlation Heatmap')
-    plt.tight_layout()
+    ax.set_title(title or 'Correlation Heatmap')
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(save_path, dpi=dpi)
         print(f"✅ Heatmap saved: {save_path}")
         return save_path
     else:
@@ -283,6 +375,38 @@ def create_heatmap(
         return "displayed"
 
 
+def render_all(
+    tasks: List[Tuple[Callable, Dict[str, Any]]],
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Render several saved charts concurrently.
+    
+    Args:
+        tasks: (chart function, keyword arguments) pairs; every task must
+            pass save_path
+        max_workers: Number of threads (default: one per CPU)
+        
+    Returns:
+        Paths to saved plots, in task order
+        
+    Example:
+        render_all([
+            (create_bar_chart, {'df': df, 'x_column': 'Region', 'y_column': 'Sales',
+                                'save_path': 'bar.png'}),
+            (create_heatmap, {'df': corr, 'save_path': 'heatmap.png'}),
+        ])
+    """
+    if not all(kwargs.get('save_path') for _, kwargs in tasks):
+        raise ValueError("render_all only renders saved charts; pass save_path for every task")
+    
+    # Import matplotlib before starting threads
+    _plotting()
+    
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(lambda task: task[0](**task[1]), tasks))
+
+
 if __name__ == "__main__":
     # Test with sample data
     np.random.seed(42)
@@ -300,3 +424,4 @@ if __name__ == "__main__":
     print("  - create_pie_chart()")
     print("  - create_line_chart()")
     print("  - create_heatmap()")
+    print("  - render_all()")
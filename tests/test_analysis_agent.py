@@ -0,0 +1,144 @@
+"""Tests for the analysis agent's code and insights caches."""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import sales_agent.agents.analysis_agent as analysis_agent
+import sales_agent.functions.data_ops as data_ops
+import sales_agent.utils.code_executor as code_executor
+from sales_agent.utils.llm_cache import dataframe_fingerprint
+
+
+@pytest.fixture
+def fake_llm():
+    """Fake chat model answering with a different snippet per call."""
+    return FakeListChatModel(responses=[
+        "result = df['Sales'].sum()",
+        "result = df['Sales'].max()",
+        "result = df['Sales'].min()",
+        "result = len(df)",
+    ])
+
+
+@pytest.fixture
+def agent(monkeypatch, fake_llm):
+    """AnalysisAgent on a small DataFrame, with empty caches."""
+    monkeypatch.setattr(analysis_agent, 'get_llm', lambda: fake_llm)
+    analysis_agent._code_cache.clear()
+    analysis_agent._insights_cache.clear()
+
+    agent = analysis_agent.AnalysisAgent()
+    agent.df = pd.DataFrame({'Product': ['A', 'B'], 'Sales': [100.0, 200.0]})
+    agent._refresh_data_context()
+    return agent
+
+
+def test_code_cache_miss_then_hit(agent, fake_llm):
+    """Test that a query is generated once per DataFrame and context."""
+    outcome = agent.execute_analysis('total sales')
+    assert outcome['data'] == 300.0
+    assert fake_llm.i == 1
+
+    agent._history.clear()
+    assert agent.execute_analysis('Total  Sales')['data'] == 300.0
+    assert fake_llm.i == 1
+
+
+def test_code_cache_misses_for_other_data(agent, fake_llm):
+    """Test that a different DataFrame doesn't reuse cached code."""
+    agent.execute_analysis('total sales')
+
+    agent.df = agent.df.assign(Sales=[1.0, 2.0])
+    agent._refresh_data_context()
+    agent._history.clear()
+    agent.execute_analysis('total sales')
+    assert fake_llm.i == 2
+
+
+def test_repeated_query_in_other_context_regenerates(agent, fake_llm):
+    """Test that a repeated query is only reused under the same earlier queries."""
+    agent.execute_analysis('same for Q1')
+    agent.execute_analysis('top product')
+    assert fake_llm.i == 2
+
+    agent.execute_analysis('same for Q1')
+    assert fake_llm.i == 3
+
+
+def test_failed_code_is_not_cached(agent):
+    """Test that code that fails to run is regenerated on retry."""
+    agent.llm = FakeListChatModel(responses=[
+        "result = df['Missing'].sum()",
+        "result = df['Sales'].sum()",
+        "result = len(df)",
+    ])
+
+    assert not agent.execute_analysis('total sales')['success']
+    assert not agent._history
+    assert agent.execute_analysis('total sales')['data'] == 300.0
+    assert agent.llm.i == 2
+
+
+def test_batch_uses_code_cache(agent, fake_llm):
+    """Test that batch generation only sends uncached queries."""
+    agent.execute_analysis('total sales')
+    agent._history.clear()
+
+    outcomes = agent.execute_analysis_batch(['total sales', 'top product'])
+    assert [o['data'] for o in outcomes] == [300.0, 200.0]
+    assert fake_llm.i == 2
+    assert [q for q, _ in agent._history] == ['total sales', 'top product']
+
+
+@pytest.mark.parametrize('in_process', [False, True])
+def test_run_code_keeps_in_place_edits(agent, monkeypatch, in_process):
+    """Test that value edits persist and refresh the fingerprint on both paths."""
+    if in_process:
+        def broken_pool(df, code, df_id):
+            raise BrokenProcessPool('test')
+        monkeypatch.setattr(code_executor, '_execute_in_pool', broken_pool)
+    fingerprint = agent._df_fingerprint
+
+    outcome = agent._run_code('double', "df['Sales'] = df['Sales'] * 2\nresult = 1")
+    assert outcome['success']
+    assert agent.df['Sales'].tolist() == [200.0, 400.0]
+    assert agent._df_fingerprint == dataframe_fingerprint(agent.df) != fingerprint
+
+
+@pytest.mark.parametrize('in_process', [False, True])
+def test_run_code_adopts_rebound_df(agent, monkeypatch, in_process):
+    """Test that reassigning df replaces the agent's frame on both paths."""
+    if in_process:
+        def broken_pool(df, code, df_id):
+            raise BrokenProcessPool('test')
+        monkeypatch.setattr(code_executor, '_execute_in_pool', broken_pool)
+
+    outcome = agent._run_code('filter', "df = df[df['Sales'] > 150]\nresult = len(df)")
+    assert outcome['data'] == 1
+    assert agent.df['Product'].tolist() == ['B']
+    assert agent._df_fingerprint == dataframe_fingerprint(agent.df)
+
+
+def test_insights_cache(agent, monkeypatch):
+    """Test that insights are computed once per DataFrame."""
+    calls = []
+
+    def counting_insights(df):
+        calls.append(len(df))
+        return {'total_sales': 300.0, 'total_records': len(df), 'columns': list(df.columns)}
+
+    monkeypatch.setattr(data_ops, 'calculate_insights', counting_insights)
+    agent._proactive_analysis()
+    agent._proactive_analysis()
+    assert calls == [2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
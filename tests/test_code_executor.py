@@ -0,0 +1,86 @@
+"""Tests for the generated-code executor."""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from sales_agent.utils.code_executor import (
+    unsafe_operations_check,
+    execute_pandas_code,
+)
+
+
+@pytest.fixture
+def sample_dataframe():
+    """Create a small sales DataFrame."""
+    return pd.DataFrame({
+        'Product': ['A', 'B', 'A'],
+        'Sales': [100.0, 200.0, 300.0],
+    })
+
+
+@pytest.mark.parametrize('code', [
+    "import os",
+    "import posix",
+    "import runpy",
+    "import io\nio.open('x.txt', 'w')",
+    "from io import open",
+    "from . import x",
+    "from pandas.io.common import os as o\nresult = o.popen('id').read()",
+    "from pandas.io.common import os",
+    "pd.io.common.os.getcwd()",
+    "np.lib.npyio.os.getcwd()",
+    "result = df.__class__",
+    "eval('1 + 1')",
+])
+def test_unsafe_code_rejected(code, sample_dataframe):
+    """Test that sandbox escapes are rejected before running."""
+    assert not unsafe_operations_check(code)
+    assert execute_pandas_code(sample_dataframe, code) == {
+        'success': False, 'error': 'Unsafe code detected'
+    }
+
+
+@pytest.mark.parametrize('code', [
+    "import math\nresult = math.sqrt(df['Sales'].sum())",
+    "import matplotlib.pyplot as plt",
+    "from collections import Counter\nresult = Counter(df['Product'])",
+])
+def test_allowed_imports(code):
+    """Test that analysis libraries can still be imported."""
+    assert unsafe_operations_check(code)
+
+
+@pytest.mark.parametrize('code', [
+    "from pandas.io.common import os",
+    "from numpy.lib.npyio import os",
+])
+def test_safe_import_rejects_banned_names(code):
+    """Test that the runtime import hook checks imported names as well."""
+    from sales_agent.utils.code_executor import _run_code
+    outcome = _run_code(pd.DataFrame(), code)
+    assert not outcome['success']
+    assert 'not allowed' in outcome['error']
+
+
+def test_execute_pandas_code(sample_dataframe):
+    """Test running generated code against the DataFrame."""
+    outcome = execute_pandas_code(
+        sample_dataframe, "result = df.groupby('Product')['Sales'].sum()"
+    )
+    assert outcome['success']
+    assert outcome['result']['A'] == 400.0
+
+
+@pytest.mark.parametrize('code', [
+    "result = df.apply(lambda row: np.log(row['Sales']), axis=1).round(2).tolist()",
+    "result = [np.log(v) for v in df['Sales']]",
+    "result = hasattr(df, 'Sales') and callable(len) and pow(2, 3) == ord(chr(8))",
+])
+def test_execute_pandas_code_namespace(code, sample_dataframe):
+    """Test that nested scopes see df/np and common builtins are available."""
+    outcome = execute_pandas_code(sample_dataframe, code)
+    assert outcome['success'], outcome.get('error')
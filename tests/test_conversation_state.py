@@ -0,0 +1,37 @@
+"""Tests for conversation state tracking."""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import sales_agent.utils.conversation_state as conversation_state
+from sales_agent.utils.conversation_state import ConversationState
+
+
+def test_recent_messages_fits_token_budget():
+    """Test that the newest messages within the budget are returned in order."""
+    state = ConversationState()
+    for i in range(5):
+        state.add_message('user', f'{i}' * 40)  # 10 tokens each
+
+    recent = state.recent_messages(token_budget=25)
+    assert [m['content'][0] for m in recent] == ['3', '4']
+    assert state.recent_messages(token_budget=5) == []
+    assert len(state.recent_messages(token_budget=1000)) == 5
+
+
+def test_token_estimate_tracks_evictions(monkeypatch):
+    """Test that evicted messages are subtracted from the rolling estimate."""
+    monkeypatch.setattr(conversation_state, 'MAX_MESSAGES', 3)
+    state = ConversationState()
+    for content in ['a' * 40, 'b' * 80, 'c' * 40, 'd' * 4]:
+        state.add_message('user', content)
+
+    assert len(state.messages) == 3
+    assert state.token_estimate == 20 + 10 + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from sales_agent.functions.data_ops import (
     read_sales_data,
+    clean_sales_data,
     filter_data,
     group_and_aggregate,
     calculate_insights,
@@ -27,6 +28,33 @@ def sample_dataframe():
     })
 
 
+def test_clean_sales_data():
+    """Test one-shot cleaning of text and numeric-looking columns."""
+    raw = pd.DataFrame({
+        'Product': [' A', 'B ', None],
+        'Sales': [' 100', '200 ', '300'],
+    })
+    cleaned = clean_sales_data(raw)
+    assert cleaned['Product'].tolist()[:2] == ['A', 'B']
+    assert pd.api.types.is_numeric_dtype(cleaned['Sales'])
+    assert cleaned['Sales'].sum() == 600
+    assert raw['Sales'].iloc[0] == ' 100'
+
+
+def test_clean_sales_data_keeps_codes_and_mixed_text():
+    """Test that zero-padded codes and partly numeric columns stay text."""
+    raw = pd.DataFrame({
+        'Zip': ['02134', '10001', '94105'],
+        'Notes': ['1', '2', 'n/a'],
+        'Units': ['5', '', '7'],
+    })
+    cleaned = clean_sales_data(raw)
+    assert cleaned['Zip'].tolist() == ['02134', '10001', '94105']
+    assert cleaned['Notes'].tolist() == ['1', '2', 'n/a']
+    assert pd.api.types.is_numeric_dtype(cleaned['Units'])
+    assert cleaned['Units'].sum() == 12
+
+
 def test_filter_data(sample_dataframe):
     """Test data filtering."""
     filtered = filter_data(sample_dataframe, {'Product': 'A'})
@@ -46,6 +74,24 @@ def test_group_and_aggregate(sample_dataframe):
     assert 'Quantity' in grouped.columns
 
 
+@pytest.mark.parametrize(
+    'dtype', ['int8', 'uint8', 'int64', 'float64', 'Int64', 'Float64']
+)
+def test_group_and_aggregate_fused_matches_pandas(sample_dataframe, dtype):
+    """Test the numba single-key path against pandas groupby."""
+    pytest.importorskip("numba")
+    # Values fit in int8, group sums don't
+    df = sample_dataframe.assign(Sales=sample_dataframe['Sales'] % 120).astype({'Sales': dtype})
+    if dtype[0].isupper():
+        df.loc[0, 'Sales'] = pd.NA
+    
+    grouped = group_and_aggregate(df, 'Product', {'Sales': 'sum'})
+    expected = df.groupby('Product', sort=False)['Sales'].sum()
+    
+    assert grouped.set_index('Product')['Sales'].to_dict() == expected.to_dict()
+    assert grouped['Sales'].dtype == expected.dtype
+
+
 def test_calculate_insights(sample_dataframe):
     """Test insights calculation."""
     insights = calculate_insights(sample_dataframe)
@@ -0,0 +1,64 @@
+"""Tests for the LLM response cache helpers."""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from sales_agent.utils.llm_cache import (
+    InMemoryCache,
+    dataframe_fingerprint,
+    make_cache_key,
+)
+
+
+def test_make_cache_key_normalizes_query():
+    """Test that case and whitespace differences share a key."""
+    assert make_cache_key('fp', 'Total  Sales ') == make_cache_key('fp', 'total sales')
+    assert make_cache_key('fp', 'total sales') != make_cache_key('other', 'total sales')
+
+
+def test_make_cache_key_includes_context():
+    """Test that earlier queries are part of the key."""
+    assert make_cache_key('fp', 'same for Q1', ['sales by region']) != make_cache_key(
+        'fp', 'same for Q1', ['profit by product']
+    )
+    assert make_cache_key('fp', 'total sales', []) == make_cache_key('fp', 'total sales')
+
+
+def test_dataframe_fingerprint_tracks_content():
+    """Test that the fingerprint changes with the data."""
+    df = pd.DataFrame({'Sales': [1, 2, 3]})
+    assert dataframe_fingerprint(df) == dataframe_fingerprint(df.copy())
+    assert dataframe_fingerprint(df) != dataframe_fingerprint(df.assign(Sales=[1, 2, 4]))
+    assert dataframe_fingerprint(df) != dataframe_fingerprint(df.rename(columns={'Sales': 'Units'}))
+    assert dataframe_fingerprint(df) != dataframe_fingerprint(df.astype('float64'))
+
+
+def test_in_memory_cache_hit_and_miss():
+    """Test get/set and misses."""
+    cache = InMemoryCache(maxsize=2)
+    assert cache.get('a') is None
+    cache.set('a', 'code')
+    assert cache.get('a') == 'code'
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.get('a') is None
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    """Test LRU eviction once maxsize is exceeded."""
+    cache = InMemoryCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
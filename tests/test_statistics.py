@@ -1,6 +1,7 @@
 """Tests for statistics module."""
 
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
@@ -11,6 +12,8 @@ from sales_agent.functions.statistics import (
     calculate_quarter_sales,
     add_quarter_sales_column,
     calculate_growth_rate,
+    detect_outliers,
+    calculate_correlation,
 )
 
 
@@ -38,6 +41,16 @@ def test_calculate_quarter_sales(sample_sales_data):
     assert total == expected
 
 
+def test_calculate_quarter_sales_ignores_invalid_months(sample_sales_data):
+    """Test that months outside 1-12 match nothing, including missing dates."""
+    df = pd.concat(
+        [sample_sales_data, pd.DataFrame({'Date': [pd.NaT], 'Sales': [999]})],
+        ignore_index=True
+    )
+    total = calculate_quarter_sales(df, 'Sales', 'Date', [0, 11, 13])
+    assert total == 1000 + 1500
+
+
 def test_add_quarter_sales_column(sample_sales_data):
     """Test adding quarter sales column."""
     df_with_quarter = add_quarter_sales_column(
@@ -51,6 +64,52 @@ def test_add_quarter_sales_column(sample_sales_data):
     assert df_with_quarter['Q4_Sales'].iloc[0] == 11000
 
 
+@pytest.mark.parametrize('method, values', [
+    ('iqr', [10, 11, 12, 13, 14, 100]),
+    ('zscore', [10] * 20 + [100]),  # |z| of the 100 is sqrt(20) with ddof=0
+])
+def test_detect_outliers(method, values):
+    """Test that the extreme value is flagged and missing values are in neither set."""
+    df = pd.DataFrame({'Sales': values + [np.nan]})
+    outliers, clean = detect_outliers(df, 'Sales', method=method)
+    assert outliers['Sales'].tolist() == [100]
+    assert len(clean) == len(values) - 1
+    assert clean['Sales'].notna().all()
+
+
+@pytest.mark.parametrize('method', ['iqr', 'zscore'])
+def test_detect_outliers_constant_column(method):
+    """Test that a constant column has no outliers."""
+    df = pd.DataFrame({'Sales': [5.0, 5.0, 5.0, 5.0]})
+    outliers, clean = detect_outliers(df, 'Sales', method=method)
+    assert outliers.empty
+    assert len(clean) == 4
+
+
+def test_detect_outliers_invalid_method():
+    """Test that unknown methods are rejected."""
+    with pytest.raises(ValueError):
+        detect_outliers(pd.DataFrame({'Sales': [1.0]}), 'Sales', method='mad')
+
+
+@pytest.mark.parametrize('has_missing', [False, True])
+def test_calculate_correlation_matches_pandas(has_missing):
+    """Test the np.corrcoef path and the pairwise fallback against DataFrame.corr."""
+    df = pd.DataFrame({
+        'Sales': [100.0, 200.0, 150.0, 300.0, 250.0],
+        'Quantity': [10.0, 21.0, 14.0, 33.0, 24.0],
+        'Discount': [5.0, 1.0, 4.0, 0.0, 2.0],
+        'Product': list('ABCAB'),
+    })
+    if has_missing:
+        df.loc[1, 'Quantity'] = np.nan
+
+    corr = calculate_correlation(df)
+    expected = df.select_dtypes(include=[np.number]).corr()
+    pd.testing.assert_frame_equal(corr, expected)
+    assert list(calculate_correlation(df, ['Sales', 'Discount']).columns) == ['Sales', 'Discount']
+
+
 def test_calculate_growth_rate():
     """Test growth rate calculation."""
     growth = calculate_growth_rate(1000, 1200)